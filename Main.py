@@ -4,6 +4,8 @@ import os
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from catalog import Catalog
+
 # Pygame başlat
 pygame.init()
 
@@ -29,15 +31,34 @@ pygame.font.init()
 font = pygame.font.SysFont("Arial", 16)
 
 
+# Görsel önbelleği: aynı görseli kullanan parçalar için dosya bir kez yüklenir
+gorsel_onbellegi = {}
+
+
+def gorsel_yukle(image_path):
+    if image_path not in gorsel_onbellegi:
+        try:
+            gorsel = pygame.transform.scale(pygame.image.load(image_path), (100, 100))
+        except (pygame.error, FileNotFoundError):
+            gorsel = pygame.Surface((100, 100))
+            gorsel.fill(GRAY)
+        gorsel_onbellegi[image_path] = gorsel
+    return gorsel_onbellegi[image_path]
+
+
 # Parça sınıfı
 class Parca:
     def __init__(self, ad, maliyet, image_path, omur):
         self.ad = ad
         self.maliyet = maliyet
-        self.image = pygame.image.load(image_path)
-        self.image = pygame.transform.scale(self.image, (100, 100))
+        self.image = gorsel_yukle(image_path)
         self.omur = omur
 
+    @classmethod
+    def katalogdan(cls, part):
+        # Paylaşılan katalogdaki Part nesnesinden oluşturulur
+        return cls(part.name, part.price, part.image_path, part.lifespan)
+
 
 # Mouse montaj sınıfı
 class MouseAssembly:
@@ -83,16 +104,17 @@ class MouseAssembly:
         plt.show()
 
 
-# Parça verileri
-parca_listesi = [
-    Parca("Üst Kapak", 50, "top_cover.png", 5000),
-    Parca("Sol Tık", 30, "left_click.png", 3000),
-    Parca("Sağ Tık", 30, "right_click.png", 3000),
-    Parca("Tekerlek", 40, "scroll_wheel.png", 4000),
-    Parca("Sensör", 150, "sensor.png", 10000),
-    Parca("Devre Kartı", 200, "pcb_board.png", 8000),
-    Parca("USB Kablo", 60, "usb_cable.png", 6000)
-]
+# Parça verileri (Tk uygulamasıyla ortak katalogdan)
+parca_listesi = [Parca.katalogdan(part) for part in Catalog.get_instance().parts()]
+
+# Sağ paneldeki bir sütuna sığan parça sayısı
+SATIR_SAYISI = 5
+
+
+def parca_konumu(i):
+    # i. parçanın sağ paneldeki kutusunun sol üst köşesi
+    return WIDTH - 280 - (i // SATIR_SAYISI) * 240, 50 + (i % SATIR_SAYISI) * 120
+
 
 # Ana döngü
 mouse = MouseAssembly()
@@ -103,17 +125,16 @@ while running:
     screen.fill(WHITE)
     pygame.draw.rect(screen, BLACK, (30, 30, 650, 500), 2)
 
-    y_offset = 50
     for i, parca in enumerate(parca_listesi):
-        pygame.draw.rect(screen, GRAY, (WIDTH - 280, y_offset, 230, 110))
-        screen.blit(parca.image, (WIDTH - 270, y_offset + 5))
+        x_offset, y_offset = parca_konumu(i)
+        pygame.draw.rect(screen, GRAY, (x_offset, y_offset, 230, 110))
+        screen.blit(parca.image, (x_offset + 10, y_offset + 5))
         text_surface = font.render(f"{parca.ad} - {parca.maliyet} TL", True, BLACK)
-        screen.blit(text_surface, (WIDTH - 170, y_offset + 10))
+        screen.blit(text_surface, (x_offset + 110, y_offset + 10))
 
         button_surface = font.render("Ekle", True, BLACK)
-        pygame.draw.rect(screen, GREEN, (WIDTH - 170, y_offset + 40, 100, 30))
-        screen.blit(button_surface, (WIDTH - 150, y_offset + 50))
-        y_offset += 120
+        pygame.draw.rect(screen, GREEN, (x_offset + 110, y_offset + 40, 100, 30))
+        screen.blit(button_surface, (x_offset + 130, y_offset + 50))
 
     pygame.draw.rect(screen, BLUE, (50, 600, 200, 40))
     link_text = font.render("Maliyet Grafiğini Göster", True, WHITE)
@@ -134,7 +155,8 @@ while running:
                 mouse.parcalar = [birlesik_parca] + mouse.parcalar[2:]
                 mouse.guncelle()
             for i, parca in enumerate(parca_listesi):
-                if WIDTH - 170 <= x <= WIDTH - 70 and (50 + i * 120 + 40) <= y <= (50 + i * 120 + 70):
+                x_offset, y_offset = parca_konumu(i)
+                if x_offset + 110 <= x <= x_offset + 210 and y_offset + 40 <= y <= y_offset + 70:
                     mouse.parca_ekle(parca)
 
     clock.tick(60)
@@ -1,3 +1,6 @@
+from catalog import Catalog
+
+
 class Parca:
     def __init__(self, ad, tur, maliyet):
         """
@@ -11,6 +14,17 @@ class Parca:
         self.tur = tur
         self.maliyet = maliyet
 
+    @classmethod
+    def katalogdan(cls, part, katalog=None):
+        """
+        Paylaşılan katalogdaki bir Part nesnesinden Parca oluşturur; tür, parçanın kategorisidir.
+
+        :param part: catalog.Part nesnesi
+        :param katalog: Catalog örneği (verilmezse paylaşılan örnek kullanılır)
+        """
+        katalog = katalog or Catalog.get_instance()
+        return cls(part.name, katalog.category_of(part), part.price)
+
 class Mouse:
     def __init__(self):
         """
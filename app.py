@@ -1,112 +1,39 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog
-import sqlite3, random, datetime
+import sqlite3, random, datetime, queue, json, argparse
 from abc import ABC, abstractmethod
+from collections import OrderedDict, Counter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import openpyxl
 
 from tkinter import PhotoImage
 from PIL import Image, ImageTk  # Pillow kütüphanesi
 
+from catalog import Part, PartDatabase, Catalog
+from forecast import CostScenario, FORECAST_METHODS
+from simulation import ReplacementSimulator, UsageProfile
+from sketches import PeriodSketch
+from client import ServiceClient
+
 
 ##########################################
-# Model, Factory ve Singleton Tasarımı   #
+# Activity Database (Simülasyon Verisi)    #
 ##########################################
 
-class Part:
-    """
-    Parça model sınıfı.
-    Her parça benzersiz ID, isim, ömür (tahmini kullanım saati), fiyat ve görsel yol bilgisine sahiptir.
-    """
-
-    def __init__(self, id: int, name: str, lifespan: int, price: float, image_path: str):
-        self.id = id
-        self.name = name
-        self.lifespan = lifespan
-        self.price = price
-        self.image_path = image_path
-
-    def __repr__(self):
-        return f"Part({self.name}, Ömür: {self.lifespan}, Fiyat: {self.price} TL)"
-
-
-class PartFactory:
-    """
-    Factory Pattern ile parça nesnelerinin oluşturulması merkezi hale getirilmiştir.
-    """
-
-    @staticmethod
-    def create_part(id: int, name: str, lifespan: int, price: float, image_path: str) -> Part:
-        return Part(id, name, lifespan, price, image_path)
-
-
-class PartDatabase:
-    """
-    Singleton Pattern ile tek veritabanı bağlantısı oluşturulmuştur.
-    Parçalar, in-memory SQLite veritabanında saklanır.
-    """
-    _instance = None
-
-    def __init__(self):
-        if PartDatabase._instance is not None:
-            raise Exception("Bu sınıf yalnızca tekil olarak kullanılmalıdır!")
-        self.conn = sqlite3.connect(":memory:")
-        self.create_table()
-        self.seed_data()
-        PartDatabase._instance = self
-
-    @staticmethod
-    def get_instance():
-        if PartDatabase._instance is None:
-            PartDatabase()
-        return PartDatabase._instance
-
-    def create_table(self):
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            CREATE TABLE parts (
-                id INTEGER PRIMARY KEY,
-                name TEXT,
-                lifespan INTEGER,
-                price REAL,
-                image_path TEXT
-            )
-        """)
-        self.conn.commit()
-
-    def seed_data(self):
-        """
-        Parça veritabanına başlangıç verileri eklenir.
-        """
-        parts = [
-            (1, "Body", 5000, 20.0, "images/top_cover.png"),
-            (2, "Sensor", 3000, 15.0, "images/sensor.png"),
-            (3, "Devre Kartı", 4000, 25.0, "images/pcb_board.png"),
-            (4, "Right Düğmesi", 7000, 5.0, "images/right_click.png"),
-            (5, "Left Düğmesi", 7000, 5.0, "images/left_click.png"),
-            (6, "Scroll", 4000, 7.0, "images/scroll.png"),
-            # Alternatif isimler
-            (7, "Body Premium", 8000, 35.0, "images/top_cover.png"),
-            (8, "Sensor Pro", 5000, 30.0, "images/sensor.png"),
-            (9, "USB Kablo", 5000, 50, "images/usb_cable.png")
-        ]
-        cursor = self.conn.cursor()
-        cursor.executemany("INSERT INTO parts VALUES (?, ?, ?, ?, ?)", parts)
-        self.conn.commit()
-
-    def get_parts(self):
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM parts")
-        rows = cursor.fetchall()
-        parts = [PartFactory.create_part(*row) for row in rows]
-        return parts
+# Son değişiklik numarası; budanan (silinen) değişikliklerden sonra da geriye gitmez
+CURRENT_SEQ_QUERY = "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'activity_changes'), 0)"
 
+# Tetikleyicilerde satırın JSON karşılığı ({row}: OLD veya NEW)
+ACTIVITY_ROW_JSON = ("json_object('id', {row}.id, 'date', {row}.date, 'product', {row}.product, "
+                     "'total_cost', {row}.total_cost, 'fixed_expense', {row}.fixed_expense, "
+                     "'variable_expense', {row}.variable_expense, 'average_part_cost', {row}.average_part_cost, "
+                     "'average_part_lifespan', {row}.average_part_lifespan)")
 
-##########################################
-# Activity Database (Simülasyon Verisi)    #
-##########################################
 
 class ActivityDatabase:
     """
@@ -116,24 +43,25 @@ class ActivityDatabase:
     """
     _instance = None
 
-    def __init__(self):
+    def __init__(self, database: str = ":memory:"):
         if ActivityDatabase._instance is not None:
             raise Exception("Bu sınıf yalnızca tekil olarak kullanılmalıdır!")
-        self.conn = sqlite3.connect(":memory:")
+        self.conn = sqlite3.connect(database)
         self.create_table()
-        self.seed_data()
+        if self.is_empty():
+            self.seed_data()
         ActivityDatabase._instance = self
 
     @staticmethod
-    def get_instance():
+    def get_instance(database: str = ":memory:"):
         if ActivityDatabase._instance is None:
-            ActivityDatabase()
+            ActivityDatabase(database)
         return ActivityDatabase._instance
 
     def create_table(self):
         cursor = self.conn.cursor()
         cursor.execute("""
-            CREATE TABLE activity_log (
+            CREATE TABLE IF NOT EXISTS activity_log (
                 id INTEGER PRIMARY KEY,
                 date TEXT,
                 product TEXT,
@@ -144,8 +72,58 @@ class ActivityDatabase:
                 average_part_lifespan REAL
             )
         """)
+        # Change Data Capture: activity_log üzerindeki her değişiklik, artan sıra numarasıyla
+        # (seq) eski ve yeni satır değerleri JSON olarak activity_changes tablosuna yazılır.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS activity_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                op TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                old_row TEXT,
+                new_row TEXT
+            )
+        """)
+        # Gün bazında okumalar (yaklaşık modda yeniden oluşturulan günler) için ifade indeksi
+        cursor.execute("CREATE INDEX IF NOT EXISTS activity_log_day ON activity_log (substr(date, 1, 10))")
+        new_row = ACTIVITY_ROW_JSON.format(row="NEW")
+        old_row = ACTIVITY_ROW_JSON.format(row="OLD")
+        for event, op, row_id, old_value, new_value in (("INSERT", "I", "NEW.id", "NULL", new_row),
+                                                        ("UPDATE", "U", "NEW.id", old_row, new_row),
+                                                        ("DELETE", "D", "OLD.id", old_row, "NULL")):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS activity_log_{event.lower()} AFTER {event} ON activity_log
+                BEGIN
+                    INSERT INTO activity_changes (op, row_id, old_row, new_row)
+                    VALUES ('{op}', {row_id}, {old_value}, {new_value});
+                END
+            """)
         self.conn.commit()
 
+    def add_activity(self, date: str, product: str, total_cost: float, fixed_expense: float,
+                     variable_expense: float, average_part_cost: float, average_part_lifespan: float) -> int:
+        """
+        Yeni faaliyet kaydı ekler; değişiklik tetikleyici ile activity_changes tablosuna da yazılır.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT INTO activity_log (date, product, total_cost, fixed_expense, variable_expense,
+                                      average_part_cost, average_part_lifespan)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (date, product, total_cost, fixed_expense, variable_expense, average_part_cost, average_part_lifespan))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def prune_changes(self, up_to_seq: int):
+        """
+        activity_changes tablosundan seq'i up_to_seq'e kadar (dahil) olan kayıtları siler.
+        AUTOINCREMENT sayacı sqlite_sequence'ta korunduğundan yeni değişikliklerin seq'i artmaya devam eder.
+        """
+        self.conn.execute("DELETE FROM activity_changes WHERE seq <= ?", (up_to_seq,))
+        self.conn.commit()
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT COUNT(*) FROM activity_log").fetchone()[0] == 0
+
     def seed_data(self):
         """
         1 yıl içinde rastgele 100 kayıt oluşturulur.
@@ -235,6 +213,103 @@ class CostDisplay(Observer):
         self.label.config(text=f"Toplam Maliyet: {total_cost:.2f} TL")
 
 
+##########################################
+# Değişiklik Akışı (Change Data Capture) #
+##########################################
+
+class ActivityChange:
+    """
+    activity_changes tablosundaki tek bir değişiklik: işlem ('I', 'U', 'D'), satır id'si,
+    eski ve yeni satır değerleri (sözlük; yoksa None).
+    """
+    __slots__ = ("seq", "op", "row_id", "old", "new")
+
+    def __init__(self, seq: int, op: str, row_id: int, old_row: str, new_row: str):
+        self.seq = seq
+        self.op = op
+        self.row_id = row_id
+        self.old = json.loads(old_row) if old_row else None
+        self.new = json.loads(new_row) if new_row else None
+
+    def __repr__(self):
+        return f"ActivityChange({self.seq}, {self.op}, id={self.row_id})"
+
+
+class ChangeFeed(Observable):
+    """
+    activity_log değişikliklerini artan sıra numarasına (seq) göre gözlemcilere yayınlar.
+    Yalnızca son okunan seq'ten sonraki kayıtlar sorgulanır; tam tablo yeniden okunmaz.
+    Gözlemciler update(changes) ile değişiklik listesini alır ve kendi başlangıç seq'lerinden
+    önceki değişiklikleri yok sayar. Singleton olarak uygulanmıştır.
+
+    Tüm gözlemcilere iletilen değişiklikler poll() sonunda activity_changes'tan budanır; yeni gözlemciler
+    snapshot() ile başladığından eski değişikliklere ihtiyaç duymaz. Bu nedenle aynı veritabanındaki
+    değişiklikleri tüketen tek akış bu nesnedir.
+    """
+    _instance = None
+    BATCH_SIZE = 1000
+
+    def __init__(self, activity_db: ActivityDatabase = None):
+        if ChangeFeed._instance is not None:
+            raise Exception("Bu sınıf yalnızca tekil olarak kullanılmalıdır!")
+        super().__init__()
+        self.activity_db = activity_db or ActivityDatabase.get_instance()
+        self.last_seq = self.current_seq()
+        self.activity_db.prune_changes(self.last_seq)  # Abonelik snapshot() ile başladığından eskilere gerek yok
+        ChangeFeed._instance = self
+
+    @staticmethod
+    def get_instance():
+        if ChangeFeed._instance is None:
+            ChangeFeed()
+        return ChangeFeed._instance
+
+    def current_seq(self) -> int:
+        return self.activity_db.conn.execute(CURRENT_SEQ_QUERY).fetchone()[0]
+
+    def changes_since(self, seq: int, limit: int = BATCH_SIZE) -> list:
+        cursor = self.activity_db.conn.execute(
+            "SELECT seq, op, row_id, old_row, new_row FROM activity_changes WHERE seq > ? ORDER BY seq LIMIT ?",
+            (seq, limit))
+        return [ActivityChange(*row) for row in cursor.fetchall()]
+
+    def snapshot(self, days=None):
+        """
+        Tutarlı bir (seq, DataFrame) çifti döner: DataFrame, seq'e kadar (dahil) tüm değişiklikleri içerir.
+        Bir gözlemci bu seq'ten itibaren akışa abone olarak hiçbir değişikliği kaçırmaz veya tekrar uygulamaz.
+
+        :param days: verilirse yalnızca bu günlerin kayıtları okunur
+        """
+        conn = self.activity_db.conn
+        started = not conn.in_transaction
+        if started:
+            conn.execute("BEGIN")
+        try:
+            seq = self.current_seq()
+            df = read_activity_frame(conn, days)
+        finally:
+            if started:
+                conn.commit()
+        return seq, df
+
+    def poll(self) -> int:
+        """
+        Yeni değişiklikleri okuyup gözlemcilere bildirir.
+
+        :return: bildirilen değişiklik sayısı
+        """
+        count = 0
+        while True:
+            changes = self.changes_since(self.last_seq)
+            if not changes:
+                if count:
+                    self.activity_db.prune_changes(self.last_seq)
+                return count
+            self.last_seq = changes[-1].seq
+            count += len(changes)
+            self.notify_observers(changes)
+
+
 ##########################################
 # AssemblyComponent ve RepairProcess     #
 ##########################################
@@ -245,7 +320,10 @@ class AssemblyComponent:
     """
 
     def __init__(self, parts: list):
-        self.parts = parts  # List[Part]
+        self.parts = tuple(parts)  # Değiştirilemez; geçmiş kayıtları aynı bileşeni paylaşır
+
+    def get_ids(self):
+        return [part.id for part in self.parts]
 
     def get_names(self):
         return [part.name for part in self.parts]
@@ -257,6 +335,103 @@ class AssemblyComponent:
         return f"Assembly({self.get_names()})"
 
 
+class AssemblyChange:
+    """
+    Montaj durumundaki tek bir adımı (ekleme, birleştirme, silme, geri yükleme) temsil eder.
+    Yalnızca değişen bileşenler (konumlarıyla birlikte) saklanır; bileşenler değiştirilemez
+    olduğundan geçmiş kayıtları ve güncel durum aynı nesneleri paylaşır.
+    """
+    __slots__ = ("removed", "added")
+
+    def __init__(self, removed: tuple, added: tuple):
+        self.removed = removed  # ((konum, AssemblyComponent), ...)
+        self.added = added
+
+    @staticmethod
+    def between(components: list, removed: list, added: list):
+        """
+        Mevcut bileşen listesinden removed çıkarılıp added sona eklendiğinde oluşacak değişiklik.
+        """
+        removed_entries = tuple(sorted(((components.index(comp), comp) for comp in removed),
+                                       key=lambda entry: entry[0]))
+        start = len(components) - len(removed_entries)
+        added_entries = tuple((start + i, comp) for i, comp in enumerate(added))
+        return AssemblyChange(removed_entries, added_entries)
+
+    def is_empty(self) -> bool:
+        return not self.removed and not self.added
+
+    def inverse(self):
+        return AssemblyChange(self.added, self.removed)
+
+    def apply(self, components: list):
+        for index, comp in reversed(self.removed):
+            if components[index] is not comp:
+                raise Exception("Montaj durumu geçmiş kaydıyla uyuşmuyor!")
+            del components[index]
+        for index, comp in self.added:
+            components.insert(index, comp)
+
+
+class AssemblyHistory:
+    """
+    Geri al / yinele yığınları. Her adım bir AssemblyChange olarak tutulduğundan
+    geçmişin bellek maliyeti, montajın boyutuna değil değişiklik sayısına bağlıdır.
+    """
+
+    def __init__(self):
+        self._undo = []
+        self._redo = []
+
+    def record(self, change: AssemblyChange):
+        self._undo.append(change)
+        self._redo.clear()
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> AssemblyChange:
+        change = self._undo.pop()
+        self._redo.append(change)
+        return change.inverse()
+
+    def redo(self) -> AssemblyChange:
+        change = self._redo.pop()
+        self._undo.append(change)
+        return change
+
+
+def save_assembly(file_path: str, components: list):
+    """
+    Montaj durumunu, her bileşenin parça id'leri olarak JSON dosyasına kaydeder.
+    """
+    data = {"version": 1, "components": [comp.get_ids() for comp in components]}
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def load_assembly(file_path: str, parts: list) -> list:
+    """
+    JSON dosyasındaki montaj durumunu, verilen parça listesindeki Part nesneleriyle yeniden kurar.
+    Dosya yapısı hatalıysa veya kayıtlı bir parça veritabanında yoksa Exception fırlatılır.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        data = json.load(f)
+    components = data.get("components") if isinstance(data, dict) else None
+    if not isinstance(components, list) or not all(
+            isinstance(ids, list) and ids and all(isinstance(part_id, int) for part_id in ids)
+            for ids in components):
+        raise Exception("Geçersiz montaj dosyası: 'components' parça id listelerinden oluşmalıdır!")
+    parts_by_id = {part.id: part for part in parts}
+    missing = sorted({part_id for ids in components for part_id in ids if part_id not in parts_by_id})
+    if missing:
+        raise Exception(f"Kayıtlı parça veritabanında bulunamadı: {missing}")
+    return [AssemblyComponent([parts_by_id[part_id] for part_id in ids]) for ids in components]
+
+
 class RepairProcess(Observable):
     """
     Montaj işlemleri (mouse montajı) yönetilir.
@@ -293,10 +468,12 @@ class RepairProcess(Observable):
 class MainMenuGUI:
     """
     Ana menüde arka plan görseli ve iki seçenek (Montaj ve Faaliyet Raporları) sunulur.
+    client verilirse (ServiceClient) ekranlar verileri yerel veritabanı yerine servisten okur.
     """
 
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, client: ServiceClient = None):
         self.root = root
+        self.client = client
         self.root.title("Montajci Simülasyonu - Ana Menü")
         self.root.geometry("400x400")
 
@@ -325,12 +502,285 @@ class MainMenuGUI:
         AnalysisGUI(self.root, self)
 
 
+def lttb_downsample(x, y, threshold: int):
+    """
+    Largest-Triangle-Three-Buckets ile seriyi threshold noktaya seyreltir.
+    İlk ve son nokta korunur; her kovadan, önceki seçilen nokta ile sonraki kovanın ortalaması
+    arasında en büyük üçgeni oluşturan nokta seçilir. Böylece tepe ve dipler kaybolmaz.
+    """
+    n = len(x)
+    if threshold < 3 or n <= threshold:
+        return x, y
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(int)
+    edges = np.append(edges, n)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2]
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        selected[i + 1] = a
+    return x[selected], y[selected]
+
+
+def read_activity_frame(conn, days=None):
+    """
+    activity_log tablosu pandas DataFrame olarak okunur.
+
+    :param days: verilirse yalnızca bu günlerin (datetime.date) kayıtları tek sorguda okunur
+    """
+    if days is None:
+        df = pd.read_sql_query("SELECT * FROM activity_log", conn)
+    else:
+        df = pd.read_sql_query("SELECT * FROM activity_log WHERE substr(date, 1, 10) IN "
+                               "(SELECT value FROM json_each(?))", conn,
+                               params=(json.dumps([day.isoformat() for day in days]),))
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def assign_period(df, interval):
+    """
+    Her kayda, seçilen zaman aralığındaki döneminin başlangıç tarihi ('period') atanır.
+    """
+    if interval == "Günlük":
+        df['period'] = df['date'].dt.date
+    elif interval == "Haftalık":
+        df['period'] = df['date'].dt.to_period('W').apply(lambda r: r.start_time.date())
+    elif interval == "Aylık":
+        df['period'] = df['date'].dt.to_period('M').dt.start_time.dt.date
+    elif interval == "3 Aylık":
+        df['period'] = df['date'].dt.to_period('Q').dt.start_time.dt.date
+    elif interval == "Yıllık":
+        df['period'] = df['date'].dt.to_period('Y').dt.start_time.dt.date
+    else:
+        df['period'] = df['date'].dt.date
+    return df
+
+
+def most_used(counts) -> str:
+    """
+    En çok kullanılan ürün; eşitlikte alfabetik olarak ilk ürün seçilir.
+    Kesin rapor, canlı rapor ve Excel çıktısı aynı ürünü gösterir.
+
+    :param counts: {ürün: adet} (Counter veya pandas Series)
+    """
+    return min(counts.items(), key=lambda item: (-item[1], item[0]))[0]
+
+
+def aggregate_activity(df, interval):
+    """
+    Seçilen zaman aralığına göre veriler gruplandırılır.
+    Grup metrikleri: toplam ve ortalama maliyet, sabit/gün değişken giderler, parça başına maliyet/ömür,
+    en çok kullanılan ürün.
+    """
+    df = assign_period(df, interval)
+    agg_df = df.groupby('period').agg({
+        'total_cost': ['sum', 'mean'],
+        'fixed_expense': 'sum',
+        'variable_expense': 'sum',
+        'average_part_cost': 'mean',
+        'average_part_lifespan': 'mean',
+        'product': lambda x: most_used(x.value_counts())  # en çok kullanılan ürün
+    })
+    agg_df.columns = ['toplam_maliyet', 'ortalama_maliyet', 'sabit_gider', 'degisen_gider', 'parca_basi_maliyet',
+                      'parca_basi_omur', 'en_cok_kullanilan_urun']
+    agg_df = agg_df.reset_index()
+    return agg_df
+
+
+def period_start(date: datetime.date, interval: str) -> datetime.date:
+    """
+    Tek bir tarihin dönem başlangıcı; assign_period ile aynı sonucu verir (haftalar pazartesi başlar).
+    """
+    if interval == "Haftalık":
+        return date - datetime.timedelta(days=date.weekday())
+    if interval == "Aylık":
+        return date.replace(day=1)
+    if interval == "3 Aylık":
+        return date.replace(month=3 * ((date.month - 1) // 3) + 1, day=1)
+    if interval == "Yıllık":
+        return date.replace(month=1, day=1)
+    return date
+
+
+class LiveAggregate(Observer):
+    """
+    Bir zaman aralığı için dönemsel toplamları bellekte tutar ve ChangeFeed'den gelen
+    değişiklikleri (eski satırı çıkarıp yeni satırı ekleyerek) artımlı olarak uygular.
+    to_frame(), aggregate_activity ile aynı sütunları üretir.
+    """
+    SUM_COLUMNS = ['total_cost', 'fixed_expense', 'variable_expense', 'average_part_cost', 'average_part_lifespan']
+
+    def __init__(self, interval: str, seq: int, df, on_change=None):
+        self.interval = interval
+        self.seq = seq  # Bu seq'e kadarki değişiklikler df'e zaten dahil
+        self.on_change = on_change
+        self.periods = {}  # dönem -> [kayıt sayısı, SUM_COLUMNS toplamları, ürün sayaçları]
+        if len(df):
+            df = assign_period(df, interval)
+            grouped = df.groupby('period')
+            sums = grouped[self.SUM_COLUMNS].sum()
+            counts = grouped.size()
+            product_counts = df.groupby(['period', 'product']).size()
+            for period, row in sums.iterrows():
+                self.periods[period] = [int(counts[period]), row.tolist(), Counter()]
+            for (period, product), count in product_counts.items():
+                self.periods[period][2][product] = int(count)
+
+    def apply_row(self, row: dict, sign: int):
+        period = period_start(datetime.date.fromisoformat(row['date'][:10]), self.interval)
+        acc = self.periods.setdefault(period, [0, [0.0] * len(self.SUM_COLUMNS), Counter()])
+        acc[0] += sign
+        acc[1] = [total + sign * (row[column] or 0.0) for total, column in zip(acc[1], self.SUM_COLUMNS)]
+        acc[2][row['product']] += sign
+        if acc[2][row['product']] <= 0:
+            del acc[2][row['product']]
+        if acc[0] <= 0:
+            del self.periods[period]
+
+    def update(self, changes):
+        applied = False
+        for change in changes:
+            if change.seq <= self.seq:
+                continue
+            if change.old:
+                self.apply_row(change.old, -1)
+            if change.new:
+                self.apply_row(change.new, +1)
+            self.seq = change.seq
+            applied = True
+        if applied and self.on_change:
+            self.on_change()
+
+    def to_frame(self):
+        rows = []
+        for period in sorted(self.periods):
+            count, (total, fixed, variable, part_cost, lifespan), products = self.periods[period]
+            rows.append((period, total, total / count, fixed, variable, part_cost / count, lifespan / count,
+                         most_used(products)))
+        return pd.DataFrame(rows, columns=['period', 'toplam_maliyet', 'ortalama_maliyet', 'sabit_gider',
+                                           'degisen_gider', 'parca_basi_maliyet', 'parca_basi_omur',
+                                           'en_cok_kullanilan_urun'])
+
+
+class SketchStore(Observer):
+    """
+    Yaklaşık analiz modu için gün bazında PeriodSketch'ler tutar.
+    Aralık sorgularında (haftalık, aylık, ...) ilgili günlerin sketch'leri birleştirilir; sorgu süresi
+    kayıt sayısına değil gün sayısına bağlıdır. Toplam/ortalama değerler kesin, p50/p95 maliyet ve
+    en çok kullanılan ürün ise hata sınırlarıyla birlikte yaklaşık olarak verilir.
+
+    Yeni kayıtlar ChangeFeed üzerinden doğrudan ilgili güne eklenir; güncellenen veya silinen kayıtların
+    günleri (t-digest silmeyi desteklemediğinden) bir sonraki sorguda, tek bir ChangeFeed.snapshot() içinde
+    veritabanından yeniden oluşturulur. Yeniden oluşturulan günün snapshot seq'i saklanır; akıştan
+    sonradan gelen ve bu seq'e kadar olan değişiklikler o güne ikinci kez uygulanmaz.
+    """
+    SUM_COLUMNS = LiveAggregate.SUM_COLUMNS
+
+    def __init__(self, change_feed: ChangeFeed, seq: int, df, on_change=None):
+        self.change_feed = change_feed
+        self.seq = seq
+        self.on_change = on_change
+        self.days = {}  # gün -> PeriodSketch
+        self.dirty_days = set()
+        self.rebuilt_at = {}  # gün -> yeniden oluşturulduğu snapshot seq'i
+        self._cache = {}  # aralık -> DataFrame (değişiklik olana kadar)
+        for day, group in df.groupby(df['date'].dt.date):
+            self.days[day] = self.build_sketch(group)
+
+    def build_sketch(self, df) -> PeriodSketch:
+        sketch = PeriodSketch(len(self.SUM_COLUMNS))
+        sketch.add_many(df['product'].to_numpy(), df[self.SUM_COLUMNS].to_numpy(dtype=float),
+                        df['total_cost'].to_numpy(dtype=float))
+        return sketch
+
+    def update(self, changes):
+        applied = False
+        for change in changes:
+            if change.seq <= self.seq:
+                continue
+            if change.op == "I":
+                row = change.new
+                day = datetime.date.fromisoformat(row['date'][:10])
+                if day not in self.dirty_days and change.seq > self.rebuilt_at.get(day, 0):
+                    sketch = self.days.setdefault(day, PeriodSketch(len(self.SUM_COLUMNS)))
+                    sketch.add(row['product'], [row[column] or 0.0 for column in self.SUM_COLUMNS],
+                               row['total_cost'] or 0.0)
+            else:
+                for row in (change.old, change.new):
+                    if row:
+                        day = datetime.date.fromisoformat(row['date'][:10])
+                        if change.seq > self.rebuilt_at.get(day, 0):
+                            self.dirty_days.add(day)
+            self.seq = change.seq
+            applied = True
+        # Akışın yetiştiği günlerin snapshot seq'lerine artık gerek yoktur
+        self.rebuilt_at = {day: seq for day, seq in self.rebuilt_at.items() if seq > self.seq}
+        if applied:
+            self._cache = {}
+            if self.on_change:
+                self.on_change()
+
+    def rebuild_dirty_days(self):
+        seq, df = self.change_feed.snapshot(self.dirty_days)
+        groups = dict(tuple(df.groupby(df['date'].dt.date)))
+        for day in self.dirty_days:
+            if day in groups:
+                self.days[day] = self.build_sketch(groups[day])
+            else:
+                self.days.pop(day, None)
+            if seq > self.seq:
+                self.rebuilt_at[day] = seq
+        self.dirty_days = set()
+
+    def aggregate(self, interval: str):
+        """
+        Günlük sketch'leri seçilen aralığın dönemlerine birleştirerek yaklaşık raporu üretir.
+        Hata sütunları: p50/p95 için quantile (rank) hatası, ürün sayımı için count-min üst sınırı.
+        """
+        if self.dirty_days:
+            self.rebuild_dirty_days()
+            self._cache = {}
+        if interval in self._cache:
+            return self._cache[interval]
+        periods = {}
+        for day, sketch in self.days.items():
+            periods.setdefault(period_start(day, interval), []).append(sketch)
+        rows = []
+        for period in sorted(periods):
+            sketch = PeriodSketch.merged(periods[period])
+            total, fixed, variable, part_cost, lifespan = sketch.sums
+            product, product_count = sketch.topk.top(1)[0]
+            rows.append((period, total, total / sketch.count, fixed, variable, part_cost / sketch.count,
+                         lifespan / sketch.count, sketch.digest.quantile(0.5), sketch.digest.rank_error(0.5),
+                         sketch.digest.quantile(0.95), sketch.digest.rank_error(0.95), product, product_count,
+                         sketch.topk.error_bound()))
+        self._cache[interval] = pd.DataFrame(rows, columns=[
+            'period', 'toplam_maliyet', 'ortalama_maliyet', 'sabit_gider', 'degisen_gider', 'parca_basi_maliyet',
+            'parca_basi_omur', 'p50_maliyet', 'p50_hata', 'p95_maliyet', 'p95_hata', 'en_cok_kullanilan_urun',
+            'urun_sayisi', 'urun_sayisi_hata'])
+        return self._cache[interval]
+
+
+# Zaman aralıklarının pandas dönem frekanslarına karşılığı
+INTERVAL_FREQS = {"Günlük": "D", "Haftalık": "W", "Aylık": "M", "3 Aylık": "Q", "Yıllık": "Y"}
+FORECAST_HORIZON = 6  # Tahmin edilecek dönem sayısı
+CHANGE_POLL_MS = 1000  # Değişiklik akışının kontrol aralığı (ms)
+
+
 class AnalysisGUI:
     """
     Analiz ekranı, faaliyet raporlarını günlük, haftalık, aylık, 3 aylık ve yıllık bazda gösterir.
     – Veriler, ActivityDatabase’den çekilir.
     – Rapor metin olarak ve grafiksel olarak sunulabilir.
+    – Gelecek dönemler için maliyet tahmini ve parça fiyatı senaryosu (what-if) gösterilebilir.
     – Veriler ayrıca Excel’e aktarılabilir.
+    – Açık rapor/grafik, ChangeFeed üzerinden gelen yeni kayıtlarla artımlı olarak güncellenir.
+    – Yaklaşık modda rapor, gün bazındaki sketch'lerden (t-digest, count-min) hata sınırlarıyla üretilir.
     – "Ana Menüye Dön" butonu ile ana menüye geri dönüş sağlanır.
     """
 
@@ -338,8 +788,10 @@ class AnalysisGUI:
         self.root = root
         self.main_menu = main_menu
         self.root.title("Montajci Simülasyonu - Faaliyet Raporları")
-        self.root.geometry("800x600")
-        self.activity_db = ActivityDatabase.get_instance()
+        self.root.geometry("900x900")
+        self.client = main_menu.client
+        # Servis istemcisi varsa yerel veritabanı açılmaz; raporlar servisten okunur
+        self.activity_db = None if self.client else ActivityDatabase.get_instance()
 
         self.analysis_frame = tk.Frame(self.root)
         self.analysis_frame.pack(fill="both", expand=True)
@@ -351,112 +803,483 @@ class AnalysisGUI:
         interval_label.pack(pady=5)
         self.interval_menu = tk.OptionMenu(self.analysis_frame, self.interval_var, *intervals)
         self.interval_menu.pack(pady=5)
+        self.approximate_var = tk.BooleanVar(value=False)
+        self.approximate_check = tk.Checkbutton(self.analysis_frame, text="Yaklaşık Mod (p50/p95, hata sınırlarıyla)",
+                                                variable=self.approximate_var, command=self.refresh_live_view)
+        self.approximate_check.pack(pady=5)
+        if self.client:
+            self.approximate_check.config(state="disabled")  # Sketch'ler yerel değişiklik akışıyla tutulur
 
         # Butonlar: Raporu Göster, Grafik Göster, Excel'e Aktar, Ana Menüye Dön
         self.show_report_button = tk.Button(self.analysis_frame, text="Raporu Göster", command=self.show_report)
         self.show_report_button.pack(pady=5)
         self.show_chart_button = tk.Button(self.analysis_frame, text="Grafik Göster", command=self.show_chart)
         self.show_chart_button.pack(pady=5)
+
+        # Tahmin: yöntem seçimi ve parça fiyatı değişimi (%)
+        forecast_frame = tk.Frame(self.analysis_frame)
+        forecast_frame.pack(pady=5)
+        self.method_var = tk.StringVar(value="Üstel Düzeltme")
+        tk.OptionMenu(forecast_frame, self.method_var, *FORECAST_METHODS).grid(row=0, column=0, padx=5)
+        tk.Label(forecast_frame, text="Parça Fiyatı Değişimi (%):").grid(row=0, column=1, padx=5)
+        self.price_change_var = tk.StringVar(value="0")
+        tk.Entry(forecast_frame, textvariable=self.price_change_var, width=6).grid(row=0, column=2, padx=5)
+        self.show_forecast_button = tk.Button(forecast_frame, text="Tahmin Göster", command=self.show_forecast)
+        self.show_forecast_button.grid(row=0, column=3, padx=5)
         self.export_button = tk.Button(self.analysis_frame, text="Excel'e Aktar", command=self.export_to_excel)
         self.export_button.pack(pady=5)
         self.back_button = tk.Button(self.analysis_frame, text="Ana Menüye Dön", command=self.return_to_main)
         self.back_button.pack(pady=5)
 
         # Raporun gösterileceği metin alanı
-        self.report_text = tk.Text(self.analysis_frame, height=15, width=150)
+        self.report_text = tk.Text(self.analysis_frame, height=12, width=150)
         self.report_text.pack(pady=10)
 
+        # Grafik, ilk kullanımda oluşturulur ve sonraki tıklamalarda yalnızca çizgi verileri güncellenir
+        self.chart_canvas = None
+        self.chart_lines = {}
+
+        # Canlı rapor: toplamlar bir kez hesaplanır, sonra değişiklik akışıyla güncellenir
+        self.change_feed = None if self.client else ChangeFeed.get_instance()
+        self.live_aggregate = None
+        self.sketch_store = None  # Yaklaşık mod için gün bazında sketch'ler
+        self.live_view = None  # "report", "chart" veya None
+        self.live_interval = None
+        self.live_frame = None  # En son çizilen rapor (servis modunda gereksiz yeniden çizimi önler)
+        self.poll_job = self.root.after(CHANGE_POLL_MS, self.poll_changes)
+
     def fetch_activity_data(self):
         """
-        ActivityDatabase'den veriler pandas DataFrame olarak çekilir.
+        ActivityDatabase'den (servis modunda servisten) veriler pandas DataFrame olarak çekilir.
         """
-        query = "SELECT * FROM activity_log"
-        df = pd.read_sql_query(query, self.activity_db.conn)
-        df['date'] = pd.to_datetime(df['date'])
-        return df
+        if self.client:
+            return self.client.activity()
+        return read_activity_frame(self.activity_db.conn)
 
-    def aggregate_data(self, df, interval):
+    def aggregate_data(self, df, interval, approximate=False):
         """
         Seçilen zaman aralığına göre veriler gruplandırılır.
         Grup metrikleri: toplam ve ortalama maliyet, sabit/gün değişken giderler, parça başına maliyet/ömür,
         en çok kullanılan ürün.
+        approximate=True ise df kullanılmaz; sonuç gün bazındaki sketch'lerin birleştirilmesiyle,
+        p50/p95 maliyet ve hata sınırlarıyla birlikte üretilir.
+        """
+        if approximate:
+            return self.get_sketch_store().aggregate(interval)
+        if df is None and self.client:
+            return self.client.report(interval)
+        return aggregate_activity(df, interval)
+
+    def get_sketch_store(self):
+        """
+        Yaklaşık mod sketch'lerini ilk kullanımda bir kez oluşturur ve değişiklik akışına abone eder.
+        """
+        if self.sketch_store is None:
+            seq, df = self.change_feed.snapshot()
+            self.sketch_store = SketchStore(self.change_feed, seq, df,
+                                           on_change=lambda: self.refresh_live_view(approximate=True))
+            self.change_feed.register(self.sketch_store)
+        return self.sketch_store
+
+    def get_live_aggregate(self, interval):
+        """
+        Seçilen aralığın canlı toplamlarını döner; aralık değiştiyse veriler bir kez okunur ve
+        yeni LiveAggregate, okuma anındaki seq'ten itibaren değişiklik akışına abone edilir.
+        """
+        if self.live_aggregate is None or self.live_aggregate.interval != interval:
+            if self.live_aggregate is not None:
+                self.change_feed.unregister(self.live_aggregate)
+            seq, df = self.change_feed.snapshot()
+            self.live_aggregate = LiveAggregate(interval, seq, df,
+                                               on_change=lambda: self.refresh_live_view(approximate=False))
+            self.change_feed.register(self.live_aggregate)
+        return self.live_aggregate
+
+    def poll_changes(self):
+        """
+        Yerel modda değişiklik akışını yoklar. Servis modunda açık rapor servisten yeniden istenir;
+        servis raporu yalnızca veri değiştiğinde yeniden hesaplar, ekran da yalnızca sonuç değiştiyse çizilir.
+        """
+        self.poll_job = self.root.after(CHANGE_POLL_MS, self.poll_changes)
+        if not self.client:
+            self.change_feed.poll()
+        elif self.live_view is not None:
+            try:
+                agg_df = self.client.report(self.live_interval)
+            except Exception as e:
+                print(f"Servisten rapor alınamadı: {e}")
+                return
+            if self.live_frame is None or not agg_df.equals(self.live_frame):
+                self.draw_live_view(agg_df)
+
+    def refresh_live_view(self, approximate=None):
         """
-        if interval == "Günlük":
-            df['period'] = df['date'].dt.date
-        elif interval == "Haftalık":
-            df['period'] = df['date'].dt.to_period('W').apply(lambda r: r.start_time.date())
-        elif interval == "Aylık":
-            df['period'] = df['date'].dt.to_period('M').dt.start_time.dt.date
-        elif interval == "3 Aylık":
-            df['period'] = df['date'].dt.to_period('Q').dt.start_time.dt.date
-        elif interval == "Yıllık":
-            df['period'] = df['date'].dt.to_period('Y').dt.start_time.dt.date
+        Açık olan rapor veya grafiği, canlı toplamlardan veya yaklaşık moddaki sketch'lerden yeniden çizer.
+        approximate verilirse yalnızca seçili mod bununla aynıysa çizilir (değişiklik bildirimleri için).
+        """
+        if self.live_view is None:
+            return
+        if approximate is not None and approximate != self.approximate_var.get():
+            return
+        interval = self.live_interval
+        if self.approximate_var.get():
+            agg_df = self.aggregate_data(None, interval, approximate=True)
+        elif self.client:
+            try:
+                agg_df = self.client.report(interval)
+            except Exception as e:
+                messagebox.showerror("Servis Hatası", str(e))
+                return
+        else:
+            agg_df = self.get_live_aggregate(interval).to_frame()
+        self.draw_live_view(agg_df)
+
+    def draw_live_view(self, agg_df):
+        interval = self.live_interval
+        self.live_frame = agg_df
+        if self.live_view == "report":
+            self.report_text.delete(1.0, tk.END)
+            self.report_text.insert(tk.END, agg_df.to_string(index=False))
         else:
-            df['period'] = df['date'].dt.date
-        agg_df = df.groupby('period').agg({
-            'total_cost': ['sum', 'mean'],
-            'fixed_expense': 'sum',
-            'variable_expense': 'sum',
-            'average_part_cost': 'mean',
-            'average_part_lifespan': 'mean',
-            'product': lambda x: x.value_counts().idxmax()  # en çok kullanılan ürün
-        })
-        agg_df.columns = ['toplam_maliyet', 'ortalama_maliyet', 'sabit_gider', 'degisen_gider', 'parca_basi_maliyet',
-                          'parca_basi_omur', 'en_cok_kullanilan_urun']
-        agg_df = agg_df.reset_index()
-        return agg_df
+            self.update_chart(f"Toplam Maliyet - {interval}",
+                              {"Gerçekleşen": (agg_df['period'], agg_df['toplam_maliyet'])})
 
     def show_report(self):
-        df = self.fetch_activity_data()
-        interval = self.interval_var.get()
-        agg_df = self.aggregate_data(df, interval)
-        self.report_text.delete(1.0, tk.END)
-        self.report_text.insert(tk.END, agg_df.to_string(index=False))
+        self.live_interval = self.interval_var.get()
+        self.live_view = "report"
+        self.refresh_live_view()
+
+    def ensure_chart(self):
+        """
+        Analiz ekranına gömülü grafiği (Figure + FigureCanvasTkAgg) bir kez oluşturur.
+        """
+        if self.chart_canvas is not None:
+            return
+        figure = Figure(figsize=(9, 3.5), dpi=100)
+        self.chart_axes = figure.add_subplot(111)
+        self.chart_axes.set_xlabel("Dönem")
+        self.chart_axes.set_ylabel("Toplam Maliyet")
+        self.chart_axes.xaxis_date()
+        for name, style in (("Gerçekleşen", dict(marker='o', markersize=3)),
+                            ("Tahmin", dict(linestyle='--', marker='x')),
+                            ("Senaryo", dict(linestyle=':', marker='x'))):
+            self.chart_lines[name], = self.chart_axes.plot([], [], label=name, **style)
+        self.chart_legend = self.chart_axes.legend(loc="upper left")
+        figure.autofmt_xdate(rotation=45)
+        figure.subplots_adjust(bottom=0.25)
+        self.chart_canvas = FigureCanvasTkAgg(figure, master=self.analysis_frame)
+        self.chart_canvas.get_tk_widget().pack(fill="both", expand=True, pady=5)
+
+    def update_chart(self, title: str, series: dict):
+        """
+        Grafikteki çizgilerin verilerini günceller; verilmeyen çizgiler boşaltılır.
+        Ekran genişliğinden (piksel) fazla nokta içeren seriler LTTB ile seyreltilir.
+
+        :param series: {çizgi adı: (tarihler, değerler)}
+        """
+        self.ensure_chart()
+        widget = self.chart_canvas.get_tk_widget()
+        figure = self.chart_canvas.figure
+        width_px = widget.winfo_width() if widget.winfo_width() > 1 else int(figure.get_figwidth() * figure.dpi)
+        for name, line in self.chart_lines.items():
+            if name in series:
+                dates, values = series[name]
+                x, y = lttb_downsample(mdates.date2num(list(dates)), np.asarray(values, dtype=float), width_px)
+                line.set_data(x, y)
+            else:
+                line.set_data([], [])
+        self.chart_legend.set_visible(len(series) > 1)
+        self.chart_axes.set_title(title)
+        self.chart_axes.relim()
+        self.chart_axes.autoscale_view()
+        self.chart_canvas.draw_idle()
 
     def show_chart(self):
+        self.live_interval = self.interval_var.get()
+        self.live_view = "chart"
+        self.refresh_live_view()
+
+    def show_forecast(self):
+        """
+        Ürün bazında gelecek dönemlerin toplam maliyet tahmini hesaplanır.
+        Girilen parça fiyatı değişimi, katalogdaki fiyatlara uygulanarak senaryo tahmini de gösterilir.
+        """
+        try:
+            price_change = float(self.price_change_var.get().replace(",", "."))
+        except ValueError:
+            messagebox.showerror("Hata", "Parça fiyatı değişimi sayı olmalıdır!")
+            return
+        self.live_view = None
         df = self.fetch_activity_data()
         interval = self.interval_var.get()
+        method = self.method_var.get()
+        parts = self.client.get_parts() if self.client else Catalog.get_instance().parts()
+        scenario = CostScenario(parts, default_pct=price_change)
+        try:
+            products, future_periods, baseline, projected = scenario.project(
+                df, INTERVAL_FREQS.get(interval, "D"), FORECAST_HORIZON, method)
+        except ValueError as e:
+            messagebox.showwarning("Uyarı", str(e))
+            return
+
+        labels = [period.start_time.date() for period in future_periods]
+        forecast_df = pd.DataFrame(projected, index=products, columns=labels).round(2)
+        forecast_df.loc['TOPLAM'] = forecast_df.sum()
+        self.report_text.delete(1.0, tk.END)
+        self.report_text.insert(tk.END, f"{method} tahmini (parça fiyatı değişimi: %{price_change:g})\n")
+        self.report_text.insert(tk.END, forecast_df.to_string())
+
         agg_df = self.aggregate_data(df, interval)
-        plt.figure(figsize=(10, 5))
-        plt.plot(agg_df['period'], agg_df['toplam_maliyet'], marker='o')
-        plt.title(f"Toplam Maliyet - {interval}")
-        plt.xlabel("Dönem")
-        plt.ylabel("Toplam Maliyet")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.show()
+        series = {"Gerçekleşen": (agg_df['period'], agg_df['toplam_maliyet']),
+                  "Tahmin": (labels, baseline.sum(axis=0))}
+        if price_change:
+            series["Senaryo"] = (labels, projected.sum(axis=0))
+        self.update_chart(f"Toplam Maliyet Tahmini - {interval}", series)
 
     def export_to_excel(self):
-        df = self.fetch_activity_data()
         interval = self.interval_var.get()
-        agg_df = self.aggregate_data(df, interval)
+        if self.approximate_var.get():
+            agg_df = self.aggregate_data(None, interval, approximate=True)
+        elif self.client:
+            agg_df = self.aggregate_data(None, interval)
+        else:
+            agg_df = self.aggregate_data(self.fetch_activity_data(), interval)
         file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
         if file_path:
             agg_df.to_excel(file_path, index=False)
             messagebox.showinfo("Başarılı", f"Rapor {file_path} konumuna kaydedildi.")
 
     def return_to_main(self):
+        self.root.after_cancel(self.poll_job)
+        for observer in (self.live_aggregate, self.sketch_store):
+            if observer is not None:
+                self.change_feed.unregister(observer)
         self.analysis_frame.destroy()
-        MainMenuGUI(self.root)
+        MainMenuGUI(self.root, self.main_menu.client)
 
 
-# Parça seçildiğinde konsola yazdıran fonksiyon
-def parca_sec(parca):
-    print(f"Seçilen Parça: {parca['ad']} - Maliyet: {parca['maliyet']} - Ömür: {parca['omur']}")
+########################################
 
+class ThumbnailLoader:
+    """
+    Parça küçük resimlerini arka plan thread'lerinde açar ve boyutlandırır.
+    PhotoImage nesneleri Tk ana döngüsünde oluşturulur ve LRU önbellekte tutulur;
+    böylece aynı resim birden fazla kez çözülmez ve bellek kullanımı sınırlı kalır.
+    """
 
-parcalar = [
-    {"ad": "Üst Kapak", "maliyet": 50, "omur": 5000, "image": "images/top_cover.png"},
-    {"ad": "Sol Tık", "maliyet": 30, "omur": 3000, "image": "images/left_click.png"},
-    {"ad": "Sağ Tık", "maliyet": 30, "omur": 3000, "image": "images/right_click.png"},
-    {"ad": "Tekerlek", "maliyet": 40, "omur": 4000, "image": "images/scroll_wheel.png"},
-    {"ad": "Sensör", "maliyet": 150, "omur": 10000, "image": "images/sensor.png"},
-    {"ad": "Devre Kartı", "maliyet": 200, "omur": 8000, "image": "images/pcb_board.png"},
-    {"ad": "USB Kablo", "maliyet": 60, "omur": 6000, "image": "images/usb_cable.png"}
-]
+    def __init__(self, root: tk.Tk, size=(120, 120), max_cached: int = 256, workers: int = 2):
+        self.root = root
+        self.size = size
+        self.max_cached = max_cached
+        self._listeners = []  # Yeni resim hazır olduğunda (veya yüklenemediğinde) çağrılır
+        self._cache = OrderedDict()
+        self._pending = set()
+        self._failed = set()
+        self._results = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._polling = False
+        self._closed = False
+
+    def get(self, image_path: str):
+        """
+        Resim önbellekteyse döner; değilse yüklenmesini başlatır ve None döner.
+        """
+        if image_path in self._cache:
+            self._cache.move_to_end(image_path)
+            return self._cache[image_path]
+        if not self._closed and image_path not in self._pending and image_path not in self._failed:
+            self._pending.add(image_path)
+            self._executor.submit(self._decode, image_path)
+            if not self._polling:
+                self._polling = True
+                self.root.after(30, self._poll)
+        return None
+
+    def add_listener(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def is_failed(self, image_path: str) -> bool:
+        return image_path in self._failed
+
+    def _decode(self, image_path: str):
+        try:
+            image = Image.open(image_path)
+            image = image.resize(self.size)
+            self._results.put((image_path, image))
+        except Exception as e:
+            print(f"Resim yüklenemedi: {image_path} - {e}")
+            self._results.put((image_path, None))
+
+    def _poll(self):
+        if self._closed:
+            self._polling = False
+            return
+        changed = False
+        while not self._results.empty():
+            image_path, image = self._results.get_nowait()
+            self._pending.discard(image_path)
+            changed = True
+            if image is None:
+                self._failed.add(image_path)
+                continue
+            self._cache[image_path] = ImageTk.PhotoImage(image)
+            if len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        if changed:
+            for callback in list(self._listeners):
+                callback()
+        if self._pending:
+            self.root.after(30, self._poll)
+        else:
+            self._polling = False
 
+    def shutdown(self):
+        """
+        Bekleyen çözümlemeleri iptal eder; kapatıldıktan sonra yoklama (after) döngüsü kendiliğinden durur.
+        """
+        self._closed = True
+        self._listeners = []
+        self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class VirtualPartGrid:
+    """
+    Büyük kataloglar için sanal parça seçim grid'i.
+    Yalnızca pencereye sığan satırlar kadar hücre (resim + buton) oluşturulur; kaydırıldıkça
+    aynı hücreler yeni parçalarla yeniden doldurulur. Açılış süresi katalog boyutundan bağımsızdır.
+    Havuzda kısmen görünen bir yedek satır bulunur; kaydırma sınırı ve kaydırma çubuğu ise yalnızca
+    tamamen görünen satırlara göre hesaplanır, böylece son satır her zaman tamamen görünür hale gelebilir.
+    """
+
+    ROW_HEIGHT = 175  # İlk hücre ölçülene kadar kullanılan tahmini satır yüksekliği
+    CELL_PADY = 5
+    MAX_COLUMNS = 3
+
+    def __init__(self, window: tk.Toplevel, parts: list, thumbnails: ThumbnailLoader, on_select):
+        self.window = window
+        self.parts = parts
+        self.thumbnails = thumbnails
+        self.on_select = on_select
+        self.first_row = 0
+        self.height = 0
+        self.row_height = self.ROW_HEIGHT
+        self.cells = []  # [(frame, img_label, button)]
+
+        self.scrollbar = tk.Scrollbar(window, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.frame = tk.Frame(window)
+        self.frame.pack(side="left", fill="both", expand=True, padx=20, pady=20)
+
+        self.frame.bind("<Configure>", lambda e: self.resize(e.height))
+        window.bind("<MouseWheel>", lambda e: self.scroll_rows(-1 if e.delta > 0 else 1))
+        window.bind("<Button-4>", lambda e: self.scroll_rows(-1))
+        window.bind("<Button-5>", lambda e: self.scroll_rows(1))
+        self.thumbnails.add_listener(self.render)
+        window.bind("<Destroy>", self.on_destroy, add="+")
+        self.resize(window.winfo_reqheight())
+
+    @property
+    def total_rows(self) -> int:
+        return -(-len(self.parts) // self.MAX_COLUMNS)
+
+    @property
+    def pool_rows(self) -> int:
+        return len(self.cells) // self.MAX_COLUMNS
+
+    @property
+    def visible_rows(self) -> int:
+        """
+        Tamamen görünen satır sayısı (en az 1).
+        """
+        return max(1, self.height // self.row_height)
+
+    def add_row(self):
+        row = self.pool_rows
+        for col in range(self.MAX_COLUMNS):
+            cell = tk.Frame(self.frame)
+            cell.grid(row=row, column=col, padx=10, pady=self.CELL_PADY)
+            img_label = tk.Label(cell, width=120, height=120)
+            img_label.pack(pady=5)
+            btn = tk.Button(cell)
+            btn.pack(pady=5)
+            self.cells.append((cell, img_label, btn))
+
+    def measure_row_height(self):
+        """
+        Satır yüksekliğini doldurulmuş ilk hücrenin istenen yüksekliğinden ölçer.
+        """
+        cell = self.cells[0][0]
+        cell.update_idletasks()
+        self.row_height = max(1, cell.winfo_reqheight() + 2 * self.CELL_PADY)
+
+    def resize(self, height: int):
+        """
+        Pencere yüksekliğine yetecek kadar hücre havuzu (tamamen görünen satırlar + bir yedek satır)
+        oluşturur (gerekirse büyütür).
+        """
+        self.height = height
+        if not self.cells:
+            self.add_row()
+            self.render()
+            self.measure_row_height()
+        needed_rows = min(height // self.row_height + 1, max(1, self.total_rows))
+        while self.pool_rows < needed_rows:
+            self.add_row()
+        self.scroll_to(self.first_row)
+
+    def scroll_to(self, row: int):
+        self.first_row = max(0, min(row, self.total_rows - self.visible_rows))
+        self.render()
+
+    def scroll_rows(self, delta: int):
+        self.scroll_to(self.first_row + delta)
+
+    def on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(round(float(args[0]) * self.total_rows))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.scroll_rows(amount * self.visible_rows if unit == "pages" else amount)
+
+    def on_destroy(self, event):
+        if event.widget is self.window:
+            self.thumbnails.remove_listener(self.render)
+
+    def render(self):
+        """
+        Görünen hücreleri mevcut kaydırma konumundaki parçalarla doldurur.
+        """
+        if not self.window.winfo_exists():
+            return
+        start = self.first_row * self.MAX_COLUMNS
+        for i, (cell, img_label, btn) in enumerate(self.cells):
+            index = start + i
+            if index >= len(self.parts):
+                cell.grid_remove()
+                continue
+            part = self.parts[index]
+            photo = self.thumbnails.get(part.image_path)
+            if photo:
+                img_label.config(image=photo, text="", width=120, height=120)
+            elif self.thumbnails.is_failed(part.image_path):
+                img_label.config(image="", text="Resim yok", width=16, height=8)
+            else:
+                img_label.config(image="", text="Yükleniyor...", width=16, height=8)
+            btn.config(text=part.name, command=lambda p=part: self.on_select(p))
+            cell.grid()
+        if self.total_rows:
+            self.scrollbar.set(self.first_row / self.total_rows,
+                               min(1.0, (self.first_row + self.visible_rows) / self.total_rows))
+
+
+TCO_SIMULATION_DEVICES = 10_000  # Montaj sonunda sahip olma maliyeti için simüle edilen cihaz sayısı
 
-########################################
 
 class RepairGUI:
     """
@@ -467,12 +1290,15 @@ class RepairGUI:
     def __init__(self, root: tk.Tk, main_menu: MainMenuGUI):
         self.root = root
         self.main_menu = main_menu
+        self.client = main_menu.client
         self.root.geometry("720x360")
         self.root.title("Montajci Simülasyonu - Montaj")
 
         self.components = []
         self.component_buttons = {}
         self.selected_components = []
+        self.history = AssemblyHistory()
+        self.thumbnails = ThumbnailLoader(self.root)
 
         self.repair_frame = tk.Frame(self.root)
         self.repair_frame.pack(fill="both", expand=True)
@@ -503,6 +1329,15 @@ class RepairGUI:
         self.delete_button = tk.Button(buttons_frame, text="Sil", command=self.delete_selected_component)
         self.delete_button.grid(row=0, column=1, padx=5)
         self.delete_button.config(state="disabled")
+        self.undo_button = tk.Button(buttons_frame, text="Geri Al", command=self.undo)
+        self.undo_button.grid(row=0, column=2, padx=5)
+        self.redo_button = tk.Button(buttons_frame, text="Yinele", command=self.redo)
+        self.redo_button.grid(row=0, column=3, padx=5)
+        self.save_button = tk.Button(buttons_frame, text="Kaydet", command=self.save_session)
+        self.save_button.grid(row=0, column=4, padx=5)
+        self.load_button = tk.Button(buttons_frame, text="Yükle", command=self.load_session)
+        self.load_button.grid(row=0, column=5, padx=5)
+        self.update_history_buttons()
 
         # Ana Menüye dönüş butonu
         self.back_button = tk.Button(self.repair_frame, text="Ana Menüye Dön", command=self.return_to_main)
@@ -521,6 +1356,14 @@ class RepairGUI:
             print(f"Resim yüklenemedi: {image_path} - {e}")
             return None
 
+    def catalog_parts(self, prefix: str = "") -> list:
+        """
+        İsmi prefix ile başlayan parçalar; servis istemcisi varsa servisten, yoksa paylaşılan katalogdan okunur.
+        """
+        if self.client:
+            return self.client.get_parts(prefix)
+        return list(Catalog.get_instance().by_prefix(prefix))
+
     def update_total_cost(self):
         total = sum(comp.get_cost() for comp in self.components)
         self.repair_process.total_cost = total
@@ -569,44 +1412,84 @@ class RepairGUI:
         self.part_selection_window.title(f"{category} Parçaları")
         self.part_selection_window.geometry("480x640")
         try:
-            db = PartDatabase.get_instance()
-            parts = db.get_parts()
+            filtered_parts = self.catalog_parts(category)
         except Exception as e:
             messagebox.showerror("Veritabanı Hatası", str(e))
             return
-        filtered_parts = [part for part in parts if part.name.startswith(category)]
         sorter = OptimalSortStrategy()
         sorted_parts = sorter.sort(filtered_parts)
 
-        # Resimli grid arayüzü (parça seçim ekranı)
-        frame = tk.Frame(self.part_selection_window)
-        frame.pack(padx=20, pady=20)
-        row, col = 0, 0
-        max_columns = 3
-        self.images = []  # Resim referanslarını saklamak için
-        for part in sorted_parts:
-            img = self.load_resized_image(part.image_path, width=120, height=120)
-            if img:
-                self.images.append(img)
-                img_label = tk.Label(frame, image=img)
-                img_label.grid(row=row, column=col, padx=10, pady=10)
-                btn = tk.Button(frame, text=part.name, command=lambda p=part: self.select_part(p))
-                btn.grid(row=row + 1, column=col, padx=10, pady=5)
-                col += 1
-                if col >= max_columns:
-                    col = 0
-                    row += 2
+        # Resimli, sanal (yalnızca görünen satırları çizen) grid arayüzü
+        VirtualPartGrid(self.part_selection_window, sorted_parts, self.thumbnails, self.select_part)
 
     def select_part(self, part: Part):
-        component = AssemblyComponent([part])
-        self.components.append(component)
-        btn = tk.Button(self.components_frame, text=part.name,
-                        command=lambda comp=component: self.toggle_component_selection(comp))
-        btn.pack(side="left", padx=5)
-        self.component_buttons[component] = btn
         self.part_selection_window.destroy()
+        self.commit_change(AssemblyChange.between(self.components, [], [AssemblyComponent([part])]))
+
+    def commit_change(self, change: AssemblyChange):
+        """
+        Değişikliği uygular ve geri alınabilmesi için geçmişe kaydeder.
+        Hiçbir bileşeni değiştirmeyen adımlar (örn. boş montaja boş dosya yükleme) kaydedilmez.
+        """
+        if change.is_empty():
+            return
+        self.apply_change(change)
+        self.history.record(change)
+        self.update_history_buttons()
+
+    def apply_change(self, change: AssemblyChange):
+        """
+        Bileşen listesini ve butonlarını yalnızca değişen bileşenler için günceller.
+        """
+        self.clear_selection()
+        change.apply(self.components)
+        for _, comp in change.removed:
+            self.component_buttons.pop(comp).destroy()
+        # Sondan başa eklenir; böylece her yeni buton, zaten yerleşmiş olan sonraki bileşenin önüne konur
+        for index, comp in reversed(change.added):
+            btn = tk.Button(self.components_frame, text=" + ".join(comp.get_names()),
+                            command=lambda c=comp: self.toggle_component_selection(c))
+            if index + 1 < len(self.components):
+                btn.pack(side="left", padx=5, before=self.component_buttons[self.components[index + 1]])
+            else:
+                btn.pack(side="left", padx=5)
+            self.component_buttons[comp] = btn
         self.update_total_cost()
 
+    def update_history_buttons(self):
+        self.undo_button.config(state="normal" if self.history.can_undo() else "disabled")
+        self.redo_button.config(state="normal" if self.history.can_redo() else "disabled")
+
+    def undo(self):
+        if self.history.can_undo():
+            self.apply_change(self.history.undo())
+            self.update_history_buttons()
+
+    def redo(self):
+        if self.history.can_redo():
+            self.apply_change(self.history.redo())
+            self.update_history_buttons()
+
+    def save_session(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Files", "*.json")])
+        if file_path:
+            save_assembly(file_path, self.components)
+            messagebox.showinfo("Başarılı", f"Montaj {file_path} konumuna kaydedildi.")
+
+    def load_session(self):
+        """
+        Kayıtlı montajı yükler. Yükleme de bir adım olarak kaydedildiğinden geri alınabilir.
+        """
+        file_path = filedialog.askopenfilename(filetypes=[("JSON Files", "*.json")])
+        if not file_path:
+            return
+        try:
+            loaded = load_assembly(file_path, self.catalog_parts())
+        except Exception as e:
+            messagebox.showerror("Yükleme Hatası", str(e))
+            return
+        self.commit_change(AssemblyChange.between(self.components, list(self.components), loaded))
+
     def toggle_component_selection(self, component: AssemblyComponent):
         btn = self.component_buttons[component]
         if component in self.selected_components:
@@ -636,34 +1519,24 @@ class RepairGUI:
             messagebox.showerror("Birleştirme Hatası", str(e))
             self.clear_selection()
             return
-        for comp in self.selected_components:
-            btn = self.component_buttons.pop(comp)
-            btn.destroy()
-            if comp in self.components:
-                self.components.remove(comp)
-        self.clear_selection()
-        self.components.append(new_component)
-        new_btn = tk.Button(self.components_frame, text=" + ".join(new_component.get_names()),
-                            command=lambda comp=new_component: self.toggle_component_selection(comp))
-        new_btn.pack(side="left", padx=5)
-        self.component_buttons[new_component] = new_btn
+        self.commit_change(AssemblyChange.between(self.components, [comp1, comp2], [new_component]))
         messagebox.showinfo("Birleştirme", "Parçalar başarıyla birleştirildi!")
-        self.update_total_cost()
         if self.repair_process.is_complete(new_component):
+            profile = UsageProfile()
+            try:
+                result = ReplacementSimulator(new_component, profile).run(TCO_SIMULATION_DEVICES)
+                tco_text = f"{profile.years:g} yıllık beklenen sahip olma maliyeti: {result.mean_tco:.2f} TL"
+            except ValueError as e:
+                tco_text = f"Sahip olma maliyeti hesaplanamadı: {e}"
             messagebox.showinfo("Tamamlandı",
-                                f"Mouse tamamlandı!\nToplam Maliyet: {self.repair_process.total_cost:.2f} TL")
+                                f"Mouse tamamlandı!\nToplam Maliyet: {self.repair_process.total_cost:.2f} TL\n"
+                                + tco_text)
 
     def delete_selected_component(self):
         if len(self.selected_components) != 1:
             messagebox.showwarning("Uyarı", "Lütfen tek bir bileşen seçiniz!")
             return
-        comp = self.selected_components[0]
-        btn = self.component_buttons.pop(comp)
-        btn.destroy()
-        if comp in self.components:
-            self.components.remove(comp)
-        self.clear_selection()
-        self.update_total_cost()
+        self.commit_change(AssemblyChange.between(self.components, self.selected_components, []))
 
     def clear_selection(self):
         for comp in self.selected_components:
@@ -675,16 +1548,24 @@ class RepairGUI:
         self.delete_button.config(state="disabled")
 
     def return_to_main(self):
+        self.thumbnails.shutdown()
         self.repair_frame.destroy()
-        MainMenuGUI(self.root)
+        MainMenuGUI(self.root, self.main_menu.client)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maliyet takip uygulaması")
+    parser.add_argument("--service", help="Servis adresi (örn. http://127.0.0.1:8765); verilirse parçalar ve "
+                                          "raporlar yerel veritabanı yerine service.py üzerinden okunur")
+    args = parser.parse_args()
     root = tk.Tk()
 
-
-    # Veritabanlarını başlat
-    PartDatabase.get_instance()
-    ActivityDatabase.get_instance()
-    MainMenuGUI(root)
+    client = ServiceClient(args.service) if args.service else None
+    if client is None:
+        # Veritabanlarını başlat
+        PartDatabase.get_instance()
+        ActivityDatabase.get_instance()
+        Catalog.get_instance()
+        ChangeFeed.get_instance()
+    MainMenuGUI(root, client)
     root.mainloop()
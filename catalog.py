@@ -0,0 +1,230 @@
+import sqlite3
+import sys
+
+
+##########################################
+# Model, Factory ve Singleton Tasarımı   #
+##########################################
+
+class Part:
+    """
+    Parça model sınıfı.
+    Her parça benzersiz ID, isim, ömür (tahmini kullanım saati), fiyat ve görsel yol bilgisine sahiptir.
+    Parça nesneleri değiştirilemez; böylece katalog tarafından güvenle paylaşılabilir.
+    """
+
+    __slots__ = ("id", "name", "lifespan", "price", "image_path")
+
+    def __init__(self, id: int, name: str, lifespan: int, price: float, image_path: str):
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "lifespan", lifespan)
+        object.__setattr__(self, "price", price)
+        object.__setattr__(self, "image_path", image_path)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Part nesneleri değiştirilemez; fiyat güncellemesi için Catalog kullanılmalıdır!")
+
+    def __reduce__(self):
+        # copy, deepcopy ve pickle (örn. multiprocessing) için nesne yapıcıyla yeniden oluşturulur
+        return Part, self.key()
+
+    def key(self):
+        return self.id, self.name, self.lifespan, self.price, self.image_path
+
+    def __repr__(self):
+        return f"Part({self.name}, Ömür: {self.lifespan}, Fiyat: {self.price} TL)"
+
+
+class PartFactory:
+    """
+    Factory Pattern ile parça nesnelerinin oluşturulması merkezi hale getirilmiştir.
+    """
+
+    @staticmethod
+    def create_part(id: int, name: str, lifespan: int, price: float, image_path: str) -> Part:
+        return Part(id, name, lifespan, price, image_path)
+
+
+class PartDatabase:
+    """
+    Singleton Pattern ile tek veritabanı bağlantısı oluşturulmuştur.
+    Parçalar varsayılan olarak in-memory SQLite veritabanında saklanır; dosya yolu verilirse
+    tablo yoksa oluşturulur ve yalnızca boşsa başlangıç verileri eklenir.
+    """
+    _instance = None
+
+    def __init__(self, database: str = ":memory:"):
+        if PartDatabase._instance is not None:
+            raise Exception("Bu sınıf yalnızca tekil olarak kullanılmalıdır!")
+        self.database = database
+        self.conn = sqlite3.connect(database)
+        self.create_table()
+        if self.is_empty():
+            self.seed_data()
+        PartDatabase._instance = self
+
+    @staticmethod
+    def get_instance(database: str = ":memory:"):
+        if PartDatabase._instance is None:
+            PartDatabase(database)
+        return PartDatabase._instance
+
+    def create_table(self):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS parts (
+                id INTEGER PRIMARY KEY,
+                name TEXT,
+                lifespan INTEGER,
+                price REAL,
+                image_path TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT COUNT(*) FROM parts").fetchone()[0] == 0
+
+    def data_version(self) -> int:
+        # Başka bir bağlantı (süreç) veritabanına yazdığında değişir
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def seed_data(self):
+        """
+        Parça veritabanına başlangıç verileri eklenir.
+        """
+        parts = [
+            (1, "Body", 5000, 20.0, "images/top_cover.png"),
+            (2, "Sensor", 3000, 15.0, "images/sensor.png"),
+            (3, "Devre Kartı", 4000, 25.0, "images/pcb_board.png"),
+            (4, "Right Düğmesi", 7000, 5.0, "images/right_click.png"),
+            (5, "Left Düğmesi", 7000, 5.0, "images/left_click.png"),
+            (6, "Scroll", 4000, 7.0, "images/scroll_wheel.png"),
+            # Alternatif isimler
+            (7, "Body Premium", 8000, 35.0, "images/top_cover.png"),
+            (8, "Sensor Pro", 5000, 30.0, "images/sensor.png"),
+            (9, "USB Kablo", 5000, 50, "images/usb_cable.png")
+        ]
+        cursor = self.conn.cursor()
+        cursor.executemany("INSERT INTO parts VALUES (?, ?, ?, ?, ?)", parts)
+        self.conn.commit()
+
+    def get_parts(self):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM parts")
+        rows = cursor.fetchall()
+        parts = [PartFactory.create_part(*row) for row in rows]
+        return parts
+
+    def update_price(self, part_id: int, price: float):
+        cursor = self.conn.cursor()
+        cursor.execute("UPDATE parts SET price = ? WHERE id = ?", (price, part_id))
+        if cursor.rowcount == 0:
+            raise Exception(f"Parça bulunamadı: {part_id}")
+        self.conn.commit()
+
+
+##########################################
+# Paylaşılan Parça Kataloğu              #
+##########################################
+
+# Montaj ekranındaki kategori isimleri; parçalar isimlerinin başlangıcına göre eşleşir
+CATEGORIES = ("Body", "Sensor", "Devre Kartı", "Right Düğmesi", "Left Düğmesi", "Scroll", "USB Kablo")
+
+
+class Catalog:
+    """
+    Tüm giriş noktalarının (Tk uygulaması, pygame simülasyonu, yerel servis) paylaştığı parça kataloğu.
+    Singleton olarak uygulanmıştır; parçalar PartDatabase'den bir kez yüklenir ve değiştirilemez
+    Part nesnelerinden oluşan bir demet (tuple) olarak paylaşılır.
+
+    – Yeniden yüklemede değişmeyen parçalar için aynı Part nesnesi kullanılır (interning).
+    – Her değişiklikte version artar ve arama önbelleği temizlenir.
+    – refresh(), veritabanı başka bir bağlantıdan değiştirildiyse parçaları yeniden yükler.
+    """
+    _instance = None
+
+    def __init__(self, part_db: PartDatabase = None):
+        if Catalog._instance is not None:
+            raise Exception("Bu sınıf yalnızca tekil olarak kullanılmalıdır!")
+        self.part_db = part_db or PartDatabase.get_instance()
+        self.version = 0
+        self._parts = ()
+        self._by_id = {}
+        self._lookup_cache = {}
+        self._data_version = self.part_db.data_version()
+        self.reload()
+        Catalog._instance = self
+
+    @staticmethod
+    def get_instance():
+        if Catalog._instance is None:
+            Catalog()
+        return Catalog._instance
+
+    def _intern(self, part: Part) -> Part:
+        current = self._by_id.get(part.id)
+        if current is not None and current.key() == part.key():
+            return current
+        return PartFactory.create_part(part.id, sys.intern(part.name), part.lifespan, part.price,
+                                       sys.intern(part.image_path))
+
+    def reload(self) -> bool:
+        """
+        Parçaları veritabanından yeniden okur. Değişiklik varsa versiyonu artırır.
+
+        :return: katalog değiştiyse True
+        """
+        parts = tuple(self._intern(part) for part in self.part_db.get_parts())
+        if len(parts) == len(self._parts) and all(new is old for new, old in zip(parts, self._parts)):
+            return False
+        self._parts = parts
+        self._by_id = {part.id: part for part in parts}
+        self._lookup_cache = {}
+        self.version += 1
+        return True
+
+    def refresh(self) -> bool:
+        """
+        Veritabanı son kontrolden bu yana başka bir bağlantı tarafından değiştirildiyse yeniden yükler.
+
+        :return: katalog değiştiyse True
+        """
+        data_version = self.part_db.data_version()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        return self.reload()
+
+    def update_price(self, part_id: int, price: float):
+        self.part_db.update_price(part_id, price)
+        self.reload()
+
+    def parts(self) -> tuple:
+        return self._parts
+
+    def snapshot(self):
+        """
+        (versiyon, parçalar) çifti; versiyon karşılaştırılarak türetilmiş veriler önbelleklenebilir.
+        """
+        return self.version, self._parts
+
+    def get(self, part_id: int) -> Part:
+        return self._by_id.get(part_id)
+
+    def by_prefix(self, prefix: str) -> tuple:
+        """
+        İsmi prefix ile başlayan parçalar (kategori araması); sonuçlar versiyon değişene kadar önbelleklenir.
+        """
+        result = self._lookup_cache.get(prefix)
+        if result is None:
+            result = tuple(part for part in self._parts if part.name.startswith(prefix))
+            self._lookup_cache[prefix] = result
+        return result
+
+    def category_of(self, part: Part) -> str:
+        for category in CATEGORIES:
+            if part.name.startswith(category):
+                return category
+        return part.name
@@ -0,0 +1,59 @@
+"""
+Yerel rapor/montaj servisi (service.py) için istemci.
+"""
+import json
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode, quote
+
+import pandas as pd
+
+from catalog import PartFactory
+
+
+class ServiceClient:
+    """
+    CostService için senkron istemci; Tk uygulaması (python app.py --service ...) ve toplu işlem
+    araçları tarafından kullanılır.
+    """
+
+    def __init__(self, base_url: str = "http://127.0.0.1:8765", timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, path: str, payload=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise Exception(json.loads(e.read()).get("error", str(e)))
+
+    def get_parts(self, prefix: str = "") -> list:
+        return [PartFactory.create_part(**row) for row in self._request("/parts?" + urlencode({"prefix": prefix}))]
+
+    def assembly_cost(self, part_ids: list) -> float:
+        return self._request("/assembly/cost", {"part_ids": part_ids})["total_cost"]
+
+    def report(self, interval: str = "Aylık"):
+        """
+        Dönemsel rapor; 'period' sütunu yerel rapordaki gibi tarih (datetime.date) olarak döner.
+        """
+        df = pd.DataFrame(self._request("/report?interval=" + quote(interval)))
+        if len(df):
+            df['period'] = pd.to_datetime(df['period']).dt.date
+        return df
+
+    def activity(self):
+        """
+        Tüm faaliyet kayıtları; 'date' sütunu read_activity_frame'deki gibi datetime'a çevrilir.
+        """
+        df = pd.DataFrame(self._request("/activity"))
+        if len(df):
+            df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def record_activity(self, record: dict) -> int:
+        return self._request("/activity", record)["id"]
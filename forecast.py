@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+
+##########################################
+# Maliyet Tahmini (Forecasting)          #
+##########################################
+
+def build_series(df, freq: str, value: str = "total_cost", by: str = "product"):
+    """
+    Faaliyet kayıtlarını (ürün x dönem) matrisine dönüştürür.
+    Kaydı olmayan dönemler 0 ile doldurulur, böylece tüm seriler aynı zaman eksenini paylaşır.
+
+    :param df: 'date', by ve value sütunlarını içeren DataFrame
+    :param freq: pandas dönem frekansı ("D", "W", "M", "Q", "Y")
+    :return: (seri anahtarları, dönemler (PeriodIndex), numpy matrisi)
+    """
+    periods = df['date'].dt.to_period(freq)
+    table = df.assign(period=periods).pivot_table(index=by, columns='period', values=value,
+                                                  aggfunc='sum', fill_value=0.0)
+    full_range = pd.period_range(periods.min(), periods.max(), freq=freq)
+    table = table.reindex(columns=full_range, fill_value=0.0)
+    return list(table.index), full_range, table.to_numpy(dtype=float)
+
+
+def exponential_smoothing(series, horizon: int, alpha: float = 0.3):
+    """
+    Basit üstel düzeltme. Tüm seriler için son seviye tek bir matris çarpımıyla hesaplanır:
+    seviye = (1 - alpha)^(T-1) * y_0 + toplam(alpha * (1 - alpha)^(T-1-t) * y_t).
+
+    :param series: (n, T) veya (T,) boyutlu dizi
+    :return: (n, horizon) veya (horizon,) boyutlu tahmin
+    """
+    y = np.asarray(series, dtype=float)
+    length = y.shape[-1]
+    exponents = np.arange(length - 1, -1, -1)
+    weights = alpha * (1 - alpha) ** exponents
+    weights[0] = (1 - alpha) ** (length - 1)
+    level = y @ weights
+    return np.repeat(level[..., np.newaxis], horizon, axis=-1)
+
+
+def linear_trend(series, horizon: int):
+    """
+    En küçük kareler doğrusal trendi; eğim ve kesişim tüm seriler için vektörel olarak hesaplanır.
+
+    :param series: (n, T) veya (T,) boyutlu dizi
+    :return: (n, horizon) veya (horizon,) boyutlu tahmin
+    """
+    y = np.asarray(series, dtype=float)
+    length = y.shape[-1]
+    t = np.arange(length, dtype=float)
+    centered = t - t.mean()
+    denominator = centered @ centered
+    mean = y.mean(axis=-1)
+    slope = (y @ centered) / denominator if denominator else np.zeros_like(mean)
+    intercept = mean - slope * t.mean()
+    future = np.arange(length, length + horizon, dtype=float)
+    return intercept[..., np.newaxis] + slope[..., np.newaxis] * future
+
+
+FORECAST_METHODS = {
+    "Üstel Düzeltme": exponential_smoothing,
+    "Doğrusal Trend": linear_trend,
+}
+
+
+def forecast(series, horizon: int, method: str = "Üstel Düzeltme", **kwargs):
+    """
+    Seçilen yöntemle tahmin üretir. Negatif maliyet tahminleri 0'a çekilir.
+    """
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"Bilinmeyen tahmin yöntemi: {method}")
+    return np.clip(FORECAST_METHODS[method](series, horizon, **kwargs), 0.0, None)
+
+
+##########################################
+# What-if (Senaryo) Analizi              #
+##########################################
+
+class CostScenario:
+    """
+    Parça fiyatlarının yüzde olarak değiştirildiği bir senaryoyu temsil eder.
+    Veritabanındaki fiyatlar değiştirilmez; yalnızca katalog genelindeki fiyat oranı hesaplanır.
+
+    Toplam maliyetin parça payı (toplam - sabit - değişken gider) bu oranla ölçeklenir,
+    sabit ve değişken giderler aynen korunur.
+    """
+
+    def __init__(self, parts: list, price_changes: dict = None, default_pct: float = 0.0):
+        """
+        :param parts: Part nesneleri listesi (PartDatabase.get_parts())
+        :param price_changes: {parça id: yüzde değişim}; listede olmayan parçalara default_pct uygulanır
+        :param default_pct: varsayılan yüzde değişim (örn. 10 -> %10 zam)
+        """
+        self.parts = parts
+        self.price_changes = price_changes or {}
+        self.default_pct = default_pct
+
+    def scaled_prices(self):
+        base = np.array([part.price for part in self.parts], dtype=float)
+        pct = np.array([self.price_changes.get(part.id, self.default_pct) for part in self.parts], dtype=float)
+        return base, base * (1 + pct / 100.0)
+
+    def price_factor(self) -> float:
+        base, scaled = self.scaled_prices()
+        if base.sum() == 0:
+            return 1.0
+        return float(scaled.sum() / base.sum())
+
+    def project(self, df, freq: str, horizon: int, method: str = "Üstel Düzeltme"):
+        """
+        Ürün bazında temel ve senaryo tahminlerini üretir.
+        Her iki yöntem de seriye göre doğrusal olduğundan senaryo tahmini,
+        temel tahmine parça payı tahmininin (oran - 1) katı eklenerek bulunur.
+
+        :return: (ürünler, gelecek dönemler, temel tahmin matrisi, senaryo tahmin matrisi)
+        """
+        if df.empty:
+            raise ValueError("Tahmin için faaliyet kaydı bulunamadı!")
+        df = df.assign(part_cost=(df['total_cost'] - df['fixed_expense'] - df['variable_expense']).clip(lower=0))
+        products, periods, totals = build_series(df, freq, value='total_cost')
+        _, _, part_costs = build_series(df, freq, value='part_cost')
+        baseline = forecast(totals, horizon, method)
+        part_forecast = forecast(part_costs, horizon, method)
+        scenario = np.clip(baseline + (self.price_factor() - 1.0) * part_forecast, 0.0, None)
+        future_periods = pd.period_range(periods[-1] + 1, periods=horizon, freq=periods.freq)
+        return products, future_periods, baseline, scenario
@@ -0,0 +1,345 @@
+"""
+Yerel rapor/montaj servisi.
+
+Parça kataloğu, montaj maliyeti ve faaliyet raporlarını HTTP/JSON üzerinden sunar; böylece
+birden fazla kullanıcı (Tk uygulaması, toplu işlem araçları) aynı veritabanıyla çalışabilir.
+İstemciler client.ServiceClient'ı kullanır; Tk uygulaması --service ile servise bağlanır.
+
+    python service.py --db maliyet.db --port 8765
+    python app.py --service http://127.0.0.1:8765
+
+Uç noktalar:
+    GET  /parts?prefix=Body          -> parça listesi (OptimalSortStrategy ile sıralı)
+    POST /assembly/cost              -> {"part_ids": [1, 2]} için toplam maliyet
+    GET  /report?interval=Aylık      -> dönemsel faaliyet raporu
+    GET  /activity                   -> tüm faaliyet kayıtları (tahmin için)
+    POST /activity                   -> activity_log'a yeni kayıt
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+
+from catalog import PartDatabase, Catalog
+from app import (ActivityDatabase, OptimalSortStrategy, read_activity_frame, aggregate_activity,
+                 CURRENT_SEQ_QUERY, INTERVAL_FREQS)
+
+
+##########################################
+# Bağlantı Havuzu ve Yazma Kuyruğu       #
+##########################################
+
+class ReaderPool:
+    """
+    Salt okunur SQLite bağlantı havuzu.
+    Her sorgu, havuzdan alınan bir bağlantıyla thread havuzunda çalıştırılır; olay döngüsü bloklanmaz.
+    """
+
+    def __init__(self, database: str, size: int = 4):
+        self._connections = asyncio.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True, check_same_thread=False)
+            self._connections.put_nowait(conn)
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="reader")
+
+    async def run(self, func, *args):
+        conn = await self._connections.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, conn, *args)
+        finally:
+            self._connections.put_nowait(conn)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+
+class WriteQueue:
+    """
+    Tek yazıcı bağlantısı. Yazma istekleri kuyruğa alınır ve tek bir thread'de sırayla işlenir;
+    kuyrukta biriken istekler tek bir transaction içinde yazılır. after_batch verilirse her grubun
+    sonunda, commit'ten önce aynı transaction içinde çalıştırılır.
+    Bir grubun commit'i başarısız olursa yalnızca o gruptaki istekler hata alır; kuyruk çalışmaya devam eder.
+    """
+
+    def __init__(self, database: str, after_batch=None):
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        self._after_batch = after_batch
+        self._conn.execute("PRAGMA journal_mode=WAL")  # Okuyucular yazıcıyı beklemez
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="writer")
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, func, *args):
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((func, args, future))
+        return await future
+
+    def _write_batch(self, batch):
+        results = []
+        for func, args, _ in batch:
+            try:
+                results.append((True, func(self._conn, *args)))
+            except Exception as e:
+                results.append((False, e))
+        try:
+            if self._after_batch:
+                self._after_batch(self._conn)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        return results
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(self._executor, self._write_batch, batch)
+            except Exception as e:
+                results = [(False, e)] * len(batch)
+            for (_, _, future), (ok, value) in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def close(self):
+        if self._task:
+            self._task.cancel()
+        self._executor.shutdown(wait=True)
+        self._conn.close()
+
+
+##########################################
+# Sorgular                                #
+##########################################
+
+def query_change_seq(conn) -> int:
+    # Son değişiklik numarası; başka süreçlerin yazmalarını da kapsar (rapor önbelleği için)
+    return conn.execute(CURRENT_SEQ_QUERY).fetchone()[0]
+
+
+def prune_changes(conn):
+    # Servis değişiklik akışını tüketmez; yalnızca sqlite_sequence'taki son seq'e ihtiyaç duyar
+    conn.execute("DELETE FROM activity_changes")
+
+
+def query_activity(conn):
+    return json.loads(read_activity_frame(conn).to_json(orient="records", date_format="iso", force_ascii=False))
+
+
+def query_report(conn, interval: str):
+    agg_df = aggregate_activity(read_activity_frame(conn), interval)
+    return json.loads(agg_df.to_json(orient="records", date_format="iso", force_ascii=False))
+
+
+ACTIVITY_FIELDS = ("date", "product", "total_cost", "fixed_expense", "variable_expense",
+                   "average_part_cost", "average_part_lifespan")
+NUMERIC_ACTIVITY_FIELDS = ACTIVITY_FIELDS[2:]
+
+
+def insert_activity(conn, record: dict):
+    values = [record[field] for field in ACTIVITY_FIELDS]
+    cursor = conn.execute(f"INSERT INTO activity_log ({', '.join(ACTIVITY_FIELDS)}) "
+                          f"VALUES ({', '.join('?' * len(ACTIVITY_FIELDS))})", values)
+    return cursor.lastrowid
+
+
+def part_to_dict(part):
+    return {"id": part.id, "name": part.name, "lifespan": part.lifespan, "price": part.price,
+            "image_path": part.image_path}
+
+
+##########################################
+# HTTP Servisi                           #
+##########################################
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+class CostService:
+    """
+    asyncio tabanlı HTTP/JSON servisi.
+    Parça ve montaj maliyeti istekleri paylaşılan Catalog'dan (başka süreçlerin fiyat değişiklikleri
+    her istekte PRAGMA data_version ile kontrol edilir), rapor okumaları ReaderPool üzerinden paralel,
+    yazmalar WriteQueue üzerinden tek sırada yapılır.
+    Aynı aralık için eşzamanlı gelen rapor istekleri, veri değişmediği sürece tek bir hesaplamayı paylaşır.
+    """
+
+    def __init__(self, database: str, readers: int = 4):
+        self.database = database
+        self.readers = readers
+        part_db = PartDatabase.get_instance(database)
+        if part_db.database != database:
+            raise Exception(f"PartDatabase farklı bir veritabanıyla başlatılmış: {part_db.database}")
+        self.catalog = Catalog.get_instance()  # Parça aramaları bellekteki paylaşılan katalogdan yanıtlanır
+        self._report_cache = {}  # interval -> (activity_changes seq, asyncio.Task)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        self.write_queue = WriteQueue(self.database, after_batch=prune_changes)
+        self.reader_pool = ReaderPool(self.database, self.readers)
+        self.write_queue.start()
+        self.routes = {
+            ("GET", "/parts"): self.get_parts,
+            ("POST", "/assembly/cost"): self.assembly_cost,
+            ("GET", "/report"): self.get_report,
+            ("GET", "/activity"): self.get_activity,
+            ("POST", "/activity"): self.post_activity,
+        }
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    def close(self):
+        self.server.close()
+        self.write_queue.close()
+        self.reader_pool.close()
+
+    async def get_parts(self, params, body):
+        self.catalog.refresh()
+        parts = OptimalSortStrategy().sort(self.catalog.by_prefix(params.get("prefix", "")))
+        return [part_to_dict(part) for part in parts]
+
+    async def assembly_cost(self, params, body):
+        part_ids = body.get("part_ids")
+        if not isinstance(part_ids, list) or not part_ids or not all(
+                isinstance(part_id, int) and not isinstance(part_id, bool) for part_id in part_ids):
+            raise HTTPError(400, "part_ids tam sayı listesi olmalıdır!")
+        self.catalog.refresh()
+        parts = [self.catalog.get(part_id) for part_id in part_ids]
+        missing = [part_id for part_id, part in zip(part_ids, parts) if part is None]
+        if missing:
+            raise HTTPError(404, f"Parça bulunamadı: {missing}")
+        return {"parts": [part_to_dict(part) for part in parts],
+                "total_cost": sum(part.price for part in parts)}
+
+    async def get_report(self, params, body):
+        interval = params.get("interval", "Aylık")
+        if interval not in INTERVAL_FREQS:
+            raise HTTPError(400, f"Geçersiz aralık: {interval} (geçerli: {', '.join(INTERVAL_FREQS)})")
+        version = await self.reader_pool.run(query_change_seq)
+        cached = self._report_cache.get(interval)
+        if cached is None or cached[0] != version:
+            task = asyncio.ensure_future(self.reader_pool.run(query_report, interval))
+            self._report_cache[interval] = cached = (version, task)
+        try:
+            return await asyncio.shield(cached[1])
+        except Exception:
+            if self._report_cache.get(interval) is cached:
+                del self._report_cache[interval]
+            raise
+
+    async def get_activity(self, params, body):
+        return await self.reader_pool.run(query_activity)
+
+    async def post_activity(self, params, body):
+        missing = [field for field in ACTIVITY_FIELDS if field not in body]
+        if missing:
+            raise HTTPError(400, f"Eksik alanlar: {missing}")
+        invalid = [field for field in NUMERIC_ACTIVITY_FIELDS
+                   if isinstance(body[field], bool) or not isinstance(body[field], (int, float))]
+        if not isinstance(body["product"], str) or not body["product"]:
+            invalid.append("product")
+        try:
+            datetime.date.fromisoformat(body["date"][:10])
+        except (TypeError, ValueError):
+            invalid.append("date")
+        if invalid:
+            raise HTTPError(400, f"Geçersiz alanlar: {invalid}")
+        return {"id": await self.write_queue.submit(insert_activity, body)}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Basit HTTP/1.1 işleyicisi; bağlantı kapatılana kadar (keep-alive) istekleri sırayla yanıtlar.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                raw_body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self.dispatch(method, target, raw_body)
+                data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write((f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                              f"Content-Type: application/json; charset=utf-8\r\n"
+                              f"Content-Length: {len(data)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1")
+                             + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, raw_body: bytes):
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                return 405, {"error": "Desteklenmeyen metot"}
+            return 404, {"error": "Bulunamadı"}
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise HTTPError(400, "İstek gövdesi bir JSON nesnesi olmalıdır!")
+            return 200, await handler(params, body)
+        except json.JSONDecodeError:
+            return 400, {"error": "Geçersiz JSON"}
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+
+async def serve(database: str, host: str, port: int, readers: int):
+    # Tablolar yoksa oluşturulur ve başlangıç verileri eklenir; birikmiş değişiklik kayıtları budanır
+    activity_db = ActivityDatabase.get_instance(database)
+    activity_db.prune_changes(query_change_seq(activity_db.conn))
+    service = CostService(database, readers)
+    server = await service.start(host, port)
+    print(f"Servis çalışıyor: http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maliyet takip yerel servisi")
+    parser.add_argument("--db", default="maliyet.db", help="SQLite veritabanı dosyası")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--readers", type=int, default=4, help="Okuyucu bağlantı sayısı")
+    args = parser.parse_args()
+    asyncio.run(serve(args.db, args.host, args.port, args.readers))
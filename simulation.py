@@ -0,0 +1,162 @@
+import math
+import multiprocessing
+
+import numpy as np
+
+
+##########################################
+# Ömür Tabanlı Değişim Simülasyonu       #
+##########################################
+
+DAYS_PER_MONTH = 365.25 / 12
+
+
+class UsageProfile:
+    """
+    Cihazın kullanım profili.
+    Her cihazın günlük kullanım saati, ortalaması hours_per_day ve standart sapması hours_std olan
+    normal dağılımdan bir kez çekilir; cihaz years yıl boyunca bu yoğunlukla kullanılır.
+    """
+
+    def __init__(self, hours_per_day: float = 4.0, hours_std: float = 1.5, years: float = 3.0):
+        if hours_per_day <= 0 or years <= 0:
+            raise ValueError("Günlük kullanım ve süre pozitif olmalıdır!")
+        if hours_std < 0:
+            raise ValueError("Kullanım standart sapması negatif olamaz!")
+        self.hours_per_day = hours_per_day
+        self.hours_std = hours_std
+        self.years = years
+
+    @property
+    def horizon_days(self) -> float:
+        return self.years * 365.25
+
+    def __repr__(self):
+        return f"UsageProfile({self.hours_per_day} saat/gün, ±{self.hours_std}, {self.years} yıl)"
+
+
+class SimulationResult:
+    """
+    Simülasyon sonucu: cihaz başına beklenen toplam sahip olma maliyeti (TCO),
+    parça başına beklenen değişim sayısı ve aylık değişim takvimi.
+    """
+
+    def __init__(self, part_names: list, n_devices: int, initial_cost: float, mean_tco: float,
+                 std_tco: float, expected_replacements, schedule):
+        self.part_names = part_names
+        self.n_devices = n_devices
+        self.initial_cost = initial_cost
+        self.mean_tco = mean_tco
+        self.std_tco = std_tco
+        self.expected_replacements = expected_replacements  # (parça,) cihaz başına ortalama değişim
+        self.schedule = schedule  # (ay, parça) cihaz başına o ay beklenen değişim sayısı
+
+    @property
+    def replacement_cost(self) -> float:
+        return self.mean_tco - self.initial_cost
+
+    @property
+    def standard_error(self) -> float:
+        return self.std_tco / math.sqrt(self.n_devices)
+
+    def replacements_by_part(self) -> dict:
+        return dict(zip(self.part_names, self.expected_replacements.tolist()))
+
+    def __repr__(self):
+        return (f"SimulationResult({self.n_devices} cihaz, TCO: {self.mean_tco:.2f} ± "
+                f"{self.standard_error:.2f} TL)")
+
+
+def _simulate_batch(task):
+    """
+    Tek bir cihaz grubunu simüle eder (multiprocessing ile çağrılabilmesi için modül seviyesinde).
+    Olay bazında döngü yerine, her turda hâlâ süresi dolmamış tüm cihazlar için
+    bir sonraki arıza aynı anda çekilir; tur sayısı en fazla değişim sayısı kadardır.
+    """
+    lifespans, prices, hours_per_day, hours_std, horizon_days, n_months, shape, n, seed = task
+    rng = np.random.default_rng(seed)
+    intensity = np.clip(rng.normal(hours_per_day, hours_std, n), 1e-3, None)  # saat/gün
+    total_hours = intensity * horizon_days
+    weibull_scale = lifespans / math.gamma(1 + 1 / shape)  # ortalama ömür = lifespan
+
+    counts = np.zeros((n, len(lifespans)), dtype=np.int64)
+    schedule = np.zeros((n_months, len(lifespans)), dtype=np.int64)
+    for p in range(len(lifespans)):
+        active = np.arange(n)
+        elapsed = weibull_scale[p] * rng.weibull(shape, n)
+        while active.size:
+            failed = elapsed < total_hours[active]
+            active, elapsed = active[failed], elapsed[failed]
+            if not active.size:
+                break
+            counts[active, p] += 1
+            months = np.minimum((elapsed / intensity[active] / DAYS_PER_MONTH).astype(np.int64), n_months - 1)
+            schedule[:, p] += np.bincount(months, minlength=n_months)
+            elapsed = elapsed + weibull_scale[p] * rng.weibull(shape, active.size)
+
+    costs = counts @ prices
+    return counts.sum(axis=0), schedule, costs.sum(), (costs ** 2).sum()
+
+
+class ReplacementSimulator:
+    """
+    Monte Carlo yöntemiyle birleşik bir bileşenin (AssemblyComponent) parça arızalarını ve
+    değişimlerini simüle eder. Parça ömürleri, ortalaması Part.lifespan (kullanım saati) olan
+    Weibull dağılımından çekilir; arızalanan parça aynı fiyatla yenisiyle değiştirilir.
+    """
+
+    def __init__(self, component, profile: UsageProfile, weibull_shape: float = 2.0,
+                 batch_size: int = 100_000):
+        if not component.parts:
+            raise ValueError("Simülasyon için en az bir parça gereklidir!")
+        if batch_size <= 0:
+            raise ValueError("Grup boyutu (batch_size) pozitif olmalıdır!")
+        if weibull_shape <= 0:
+            raise ValueError("Weibull şekil parametresi pozitif olmalıdır!")
+        invalid = [part.name for part in component.parts if not part.lifespan or part.lifespan <= 0]
+        if invalid:
+            # Ömrü 0 olan parça her an arızalanır; simülasyon hiç bitmez
+            raise ValueError(f"Parça ömrü pozitif olmalıdır: {', '.join(invalid)}")
+        self.component = component
+        self.profile = profile
+        self.weibull_shape = weibull_shape
+        self.batch_size = batch_size
+
+    def run(self, n_devices: int, seed=None, processes: int = None) -> SimulationResult:
+        """
+        :param n_devices: simüle edilecek cihaz ömrü sayısı
+        :param seed: tekrarlanabilir sonuçlar için tohum
+        :param processes: verilirse gruplar multiprocessing.Pool ile paralel çalıştırılır
+        """
+        if n_devices <= 0:
+            raise ValueError("Simüle edilecek cihaz sayısı pozitif olmalıdır!")
+        parts = self.component.parts
+        lifespans = np.array([part.lifespan for part in parts], dtype=float)
+        prices = np.array([part.price for part in parts], dtype=float)
+        n_months = max(1, math.ceil(self.profile.horizon_days / DAYS_PER_MONTH))
+
+        sizes = [self.batch_size] * (n_devices // self.batch_size)
+        if n_devices % self.batch_size:
+            sizes.append(n_devices % self.batch_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        tasks = [(lifespans, prices, self.profile.hours_per_day, self.profile.hours_std,
+                  self.profile.horizon_days, n_months, self.weibull_shape, size, batch_seed)
+                 for size, batch_seed in zip(sizes, seeds)]
+
+        if processes and len(tasks) > 1:
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.map(_simulate_batch, tasks)
+        else:
+            results = [_simulate_batch(task) for task in tasks]
+
+        replacements = sum(r[0] for r in results)
+        schedule = sum(r[1] for r in results)
+        cost_sum = sum(r[2] for r in results)
+        cost_sq_sum = sum(r[3] for r in results)
+
+        initial_cost = float(prices.sum())
+        mean_replacement_cost = cost_sum / n_devices
+        variance = max(cost_sq_sum / n_devices - mean_replacement_cost ** 2, 0.0)
+        return SimulationResult([part.name for part in parts], n_devices, initial_cost,
+                                initial_cost + mean_replacement_cost, math.sqrt(variance),
+                                replacements / n_devices, schedule / n_devices)
@@ -0,0 +1,242 @@
+import hashlib
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+##########################################
+# Count-Min Sketch ve Top-K              #
+##########################################
+
+@lru_cache(maxsize=4096)
+def _hash_indexes(key: str, depth: int, width: int) -> tuple:
+    digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=8 * depth).digest()
+    return tuple(int.from_bytes(digest[8 * i:8 * (i + 1)], "little") % width for i in range(depth))
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: anahtar sayımlarını sabit bellekle, yalnızca fazla tahmin yönünde hata yaparak tutar.
+    1 - delta olasılıkla tahmin hatası epsilon * toplam sayımı aşmaz (epsilon = e / width, delta = e^-depth).
+    Aynı boyutlu sketch'ler tabloları toplanarak birleştirilebilir.
+    """
+
+    def __init__(self, width: int = 256, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self._rows = np.arange(depth)
+
+    def add(self, key, count: int = 1):
+        self.table[self._rows, _hash_indexes(key, self.depth, self.width)] += count
+        self.total += count
+
+    def estimate(self, key) -> int:
+        return int(self.table[self._rows, _hash_indexes(key, self.depth, self.width)].min())
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    def error_bound(self) -> float:
+        return self.epsilon * self.total
+
+    @classmethod
+    def merged(cls, sketches: list):
+        first = sketches[0]
+        result = cls(first.width, first.depth)
+        for sketch in sketches:
+            if (sketch.width, sketch.depth) != (first.width, first.depth):
+                raise ValueError("Yalnızca aynı boyutlu sketch'ler birleştirilebilir!")
+            result.table += sketch.table
+            result.total += sketch.total
+        return result
+
+
+class TopK:
+    """
+    En sık görülen k anahtar. Sayımlar CountMinSketch'ten tahmin edilir; aday kümesi birleştirmede
+    birleşik sketch ile yeniden tahmin edilerek k elemana indirilir.
+    """
+
+    def __init__(self, k: int = 10, width: int = 256, depth: int = 4):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = {}
+
+    def add(self, key, count: int = 1):
+        self.sketch.add(key, count)
+        self.candidates[key] = self.sketch.estimate(key)
+        if len(self.candidates) > self.k:
+            self._trim()
+
+    def _trim(self):
+        top = sorted(self.candidates.items(), key=lambda item: item[1], reverse=True)[:self.k]
+        self.candidates = dict(top)
+
+    def top(self, n: int = 1) -> list:
+        """
+        :return: [(anahtar, tahmini sayım)] büyükten küçüğe; eşit sayımlar anahtara göre sıralanır
+        """
+        return sorted(self.candidates.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def error_bound(self) -> float:
+        return self.sketch.error_bound()
+
+    @classmethod
+    def merged(cls, topks: list):
+        result = cls(topks[0].k, topks[0].sketch.width, topks[0].sketch.depth)
+        result.sketch = CountMinSketch.merged([topk.sketch for topk in topks])
+        keys = set().union(*(topk.candidates for topk in topks))
+        result.candidates = {key: result.sketch.estimate(key) for key in keys}
+        result._trim()
+        return result
+
+
+##########################################
+# t-digest                               #
+##########################################
+
+class TDigest:
+    """
+    Quantile (p50, p95 vb.) tahmini için birleştirilebilir t-digest.
+    Değerler ağırlıklı merkezlere (centroid) sıkıştırılır; k1 ölçek fonksiyonu sayesinde uçlardaki
+    merkezler küçük kalır, bu yüzden p95 gibi uç quantile'lar daha hassastır.
+    Sıkıştırma, sıralı merkezlerin k-ölçeğindeki tam sayı aralıklarına göre vektörel olarak gruplanmasıyla yapılır.
+    """
+    BUFFER_SIZE = 500
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = []
+
+    @property
+    def count(self) -> float:
+        self._flush()
+        return float(self.weights.sum())
+
+    def add(self, value: float):
+        self._buffer.append(value)
+        if len(self._buffer) >= self.BUFFER_SIZE:
+            self._flush()
+
+    def add_many(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.size:
+            self._flush()
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(values.size)]))
+
+    def _flush(self):
+        if self._buffer:
+            values = np.array(self._buffer, dtype=float)
+            self._buffer = []
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(values.size)]))
+
+    def _scale(self, q):
+        return self.compression / (2 * math.pi) * np.arcsin(2 * np.clip(q, 0.0, 1.0) - 1)
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        self.min = min(self.min, means[0])
+        self.max = max(self.max, means[-1])
+        total = weights.sum()
+        left_q = (np.cumsum(weights) - weights) / total
+        groups = np.floor(self._scale(left_q) - self._scale(0.0)).astype(np.int64)
+        _, starts = np.unique(groups, return_index=True)
+        group_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / group_weights
+        self.weights = group_weights
+
+    def quantile(self, q: float) -> float:
+        self._flush()
+        if not self.weights.size:
+            return math.nan
+        cumulative = np.cumsum(self.weights)
+        total = cumulative[-1]
+        centers = cumulative - self.weights / 2
+        return float(np.interp(q * total, np.concatenate([[0.0], centers, [total]]),
+                               np.concatenate([[self.min], self.means, [self.max]])))
+
+    def rank_error(self, q: float) -> float:
+        """
+        quantile(q) sonucunun sıra (rank) hatası üst sınırı: q'yu içeren merkezin ağırlığının yarısı / toplam.
+        Örn. 0.01 -> dönen değer gerçekte q ± 0.01 quantile'ı arasındadır.
+        """
+        self._flush()
+        if not self.weights.size:
+            return math.nan
+        cumulative = np.cumsum(self.weights)
+        index = min(int(np.searchsorted(cumulative, q * cumulative[-1])), len(cumulative) - 1)
+        return float(self.weights[index] / (2 * cumulative[-1]))
+
+    @classmethod
+    def merged(cls, digests: list):
+        result = cls(digests[0].compression)
+        for digest in digests:
+            digest._flush()
+        means = np.concatenate([digest.means for digest in digests])
+        if means.size:
+            result._compress(means, np.concatenate([digest.weights for digest in digests]))
+        return result
+
+
+##########################################
+# Dönemsel Sketch                        #
+##########################################
+
+class PeriodSketch:
+    """
+    Bir dönemin birleştirilebilir özeti: kayıt sayısı, sütun toplamları (kesin),
+    ana değer için t-digest ve anahtarlar (ürün) için TopK.
+    Küçük dönemlerin (gün) sketch'leri merged() ile büyük aralıklara (hafta, ay, yıl) birleştirilir.
+    """
+
+    def __init__(self, n_columns: int, compression: float = 100, k: int = 10):
+        self.count = 0
+        self.sums = np.zeros(n_columns)
+        self.digest = TDigest(compression)
+        self.topk = TopK(k)
+
+    def add(self, key, values, primary: float):
+        self.count += 1
+        self.sums += np.asarray(values, dtype=float)
+        self.digest.add(primary)
+        self.topk.add(key)
+
+    def add_many(self, keys, values, primary):
+        """
+        :param keys: anahtar dizisi (örn. ürün)
+        :param values: (satır, sütun) değer matrisi
+        :param primary: quantile'ı tutulacak değer dizisi
+        """
+        values = np.asarray(values, dtype=float)
+        self.count += len(values)
+        self.sums += values.sum(axis=0)
+        self.digest.add_many(primary)
+        unique_keys, counts = np.unique(np.asarray(keys), return_counts=True)
+        for key, count in zip(unique_keys.tolist(), counts.tolist()):
+            self.topk.add(key, count)
+
+    @classmethod
+    def merged(cls, sketches: list):
+        if len(sketches) == 1:
+            return sketches[0]
+        result = cls.__new__(cls)
+        result.count = sum(sketch.count for sketch in sketches)
+        result.sums = np.sum([sketch.sums for sketch in sketches], axis=0)
+        result.digest = TDigest.merged([sketch.digest for sketch in sketches])
+        result.topk = TopK.merged([sketch.topk for sketch in sketches])
+        return result
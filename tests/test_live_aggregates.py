@@ -0,0 +1,111 @@
+"""
+LiveAggregate ve SketchStore'un değişiklik akışıyla artımlı güncellenen sonuçlarının, aynı veriden
+aggregate_activity ile baştan hesaplanan raporla aynı olduğunu doğrular (Tk gerektirmez).
+"""
+import datetime
+import random
+
+import pandas as pd
+import pytest
+
+from app import (ActivityDatabase, ChangeFeed, LiveAggregate, SketchStore, INTERVAL_FREQS,
+                 aggregate_activity, read_activity_frame)
+
+EXACT_COLUMNS = ['period', 'toplam_maliyet', 'ortalama_maliyet', 'sabit_gider', 'degisen_gider',
+                 'parca_basi_maliyet', 'parca_basi_omur']
+PRODUCTS = ["Mouse", "Keyboard", "Monitor", "Laptop", "Tablet"]
+BASE_DATE = datetime.date(2024, 1, 1)
+
+
+@pytest.fixture
+def feed():
+    ActivityDatabase._instance = None
+    ChangeFeed._instance = None
+    random.seed(7)  # seed_data
+    feed = ChangeFeed(ActivityDatabase(":memory:"))
+    yield feed
+    ActivityDatabase._instance = None
+    ChangeFeed._instance = None
+
+
+def exact_report(feed, interval):
+    return aggregate_activity(read_activity_frame(feed.activity_db.conn), interval)
+
+
+def random_row(rng):
+    return ((BASE_DATE + datetime.timedelta(days=rng.randint(0, 120))).isoformat(), rng.choice(PRODUCTS),
+            round(rng.uniform(50, 300), 2), round(rng.uniform(10, 50), 2), round(rng.uniform(5, 30), 2),
+            round(rng.uniform(5, 50), 2), rng.randint(1000, 10000))
+
+
+def mutate(feed, rng, n):
+    """
+    Rastgele ekleme, güncelleme (tarih/ürün/maliyet) ve silme işlemleri uygular.
+    """
+    db = feed.activity_db
+    for _ in range(n):
+        ids = [row[0] for row in db.conn.execute("SELECT id FROM activity_log")]
+        action = rng.random()
+        if action < 0.5 or not ids:
+            db.add_activity(*random_row(rng))
+        elif action < 0.8:
+            date, product, total_cost = random_row(rng)[:3]
+            db.conn.execute("UPDATE activity_log SET date = ?, product = ?, total_cost = ? WHERE id = ?",
+                            (date, product, total_cost, rng.choice(ids)))
+            db.conn.commit()
+        else:
+            db.conn.execute("DELETE FROM activity_log WHERE id = ?", (rng.choice(ids),))
+            db.conn.commit()
+
+
+def assert_same(actual, expected, columns):
+    pd.testing.assert_frame_equal(actual[columns].reset_index(drop=True),
+                                  expected[columns].reset_index(drop=True),
+                                  check_exact=False, rtol=1e-9, check_dtype=False)
+
+
+@pytest.mark.parametrize("interval", list(INTERVAL_FREQS))
+def test_live_aggregate_matches_full_report(feed, interval):
+    rng = random.Random(interval)
+    seq, df = feed.snapshot()
+    live = LiveAggregate(interval, seq, df)
+    feed.register(live)
+    for _ in range(30):
+        mutate(feed, rng, rng.randint(1, 20))
+        feed.poll()
+        expected = exact_report(feed, interval)
+        assert_same(live.to_frame(), expected, EXACT_COLUMNS + ['en_cok_kullanilan_urun'])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sketch_store_matches_full_report_with_interleaved_rebuilds(feed, seed):
+    rng = random.Random(seed)
+    seq, df = feed.snapshot()
+    store = SketchStore(feed, seq, df)
+    feed.register(store)
+    for _ in range(40):
+        mutate(feed, rng, rng.randint(1, 20))
+        feed.poll()  # Güncellenen/silinen kayıtların günleri kirli olarak işaretlenir
+        mutate(feed, rng, rng.randint(0, 10))
+        if rng.random() < 0.5:
+            # Akışın henüz iletmediği kayıtlar yeniden oluşturmada okunur; poll'da ikinci kez sayılmamalı
+            store.aggregate(rng.choice(list(INTERVAL_FREQS)))
+        feed.poll()
+        interval = rng.choice(list(INTERVAL_FREQS))
+        assert_same(store.aggregate(interval), exact_report(feed, interval), EXACT_COLUMNS)
+
+
+def test_sketch_store_rebuild_between_poll_batches(feed):
+    rng = random.Random(1)
+    seq, df = feed.snapshot()
+    store = SketchStore(feed, seq, df, on_change=lambda: store.aggregate("Günlük"))
+    feed.register(store)
+    day = feed.activity_db.conn.execute("SELECT date FROM activity_log WHERE id = 1").fetchone()[0]
+    feed.activity_db.conn.execute("UPDATE activity_log SET total_cost = total_cost + 1 WHERE id = 1")
+    feed.activity_db.conn.commit()
+    for _ in range(ChangeFeed.BATCH_SIZE + 500):
+        feed.activity_db.add_activity(day, *random_row(rng)[1:])
+    feed.poll()
+    assert_same(store.aggregate("Günlük"), exact_report(feed, "Günlük"), EXACT_COLUMNS)
+    assert sum(sketch.count for sketch in store.days.values()) == \
+        feed.activity_db.conn.execute("SELECT COUNT(*) FROM activity_log").fetchone()[0]